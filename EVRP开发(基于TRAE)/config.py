@@ -3,7 +3,7 @@ EVRP遗传算法配置文件
 Electric Vehicle Routing Problem Configuration
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple
 
 
@@ -16,6 +16,53 @@ class GAConfig:
     mutation_rate: float = 0.1
     elite_size: int = 20
     tournament_size: int = 3
+    batch_evaluation: bool = False  # 整代向量化评估（GA中比逐个评估慢，默认关闭）
+    route_cache_size: int = 10000  # 路径评估LRU缓存容量，0表示关闭
+    split_decoder: bool = True  # 巨型路径最优分割解码（初始解与交叉子代）
+    num_workers: int = 0  # 并行评估进程数，0或1表示串行
+    ga_mode: str = 'generational'  # 进化模式: generational 整代替换 / steady_state 稳态
+    steady_state_offspring: int = 2  # 稳态模式每步产生的子代数
+    replacement: str = 'worst'  # 稳态替换策略: worst 最差个体 / similar 最相似的亲本
+    local_search_rate: float = 0.0  # 子代做局部搜索的概率，0表示关闭
+    local_search_neighbors: int = 10  # 局部搜索每个客户的近邻候选数
+    charging_placement: str = 'infeasible'  # 子代充电站布置: none / infeasible 重新布置不可行路径 / all 另删除多余充电站
+    reject_clones: bool = True  # 按规范表示拒绝重复个体，已知个体不再评估
+    construction_share: float = 0.0  # 初始种群中由节约法/扫描法构造的比例
+    crossover_operator: str = 'routes'  # 交叉算子: routes 路径交换+修复 / ox / pmx / erx / srex 巨型路径交叉
+    repair_method: str = 'regret'  # 交叉后修复: regret 后悔值插入 / greedy 逐个最优插入
+    regret_k: int = 3  # 后悔值插入考虑的路径数
+    operator_selection: str = 'uniform'  # 变异算子选择: uniform 均匀 / roulette ALNS分段权重 / ucb
+    time_limit: float = 0.0  # 运行时间上限（秒），0表示不限制
+    max_no_improvement: int = 0  # 最优解连续未改进代数上限，0表示不限制
+    target_cost: float = None  # 目标成本，达到即停止
+    checkpoint_interval: int = 50  # 每隔多少代保存检查点，0表示不按代数
+    checkpoint_seconds: float = 0.0  # 每隔多少秒保存检查点，0表示不按时间
+
+
+@dataclass
+class IslandConfig:
+    """岛屿模型配置"""
+    num_islands: int = 1  # 岛屿（进程）数，1表示不使用岛屿模型
+    migration_interval: int = 20  # 每隔多少代迁移一次
+    migration_size: int = 2  # 每次迁出的最优个体数
+    topology: str = 'ring'  # 迁移拓扑: ring 或 random
+    seed: int = 0  # 各岛随机种子的起始值
+
+
+@dataclass
+class LNSConfig:
+    """大邻域搜索配置（run_evrp.py --algorithm lns）"""
+    max_iterations: int = 20000  # 最大迭代次数
+    segment_length: int = 100  # 每段迭代数，收敛历史每段一条
+    removal_operators: List[str] = field(default_factory=lambda: ['random', 'radial', 'string'])  # 破坏算子
+    min_removal: int = 5  # 每次最少删除的客户数
+    max_removal: int = 40  # 每次最多删除的客户数
+    removal_fraction: float = 0.15  # 删除个数上限占客户数的比例
+    max_string_length: int = 10  # string破坏中每个客户串的最大长度
+    regret_k: int = 3  # 重建时后悔值插入考虑的路径数，1为贪心插入
+    start_temperature: float = 0.01  # 模拟退火初始温度（相对初始成本）
+    end_temperature: float = 0.0001  # 模拟退火终止温度（相对初始成本）
+    operator_selection: str = 'roulette'  # 破坏算子选择: roulette / ucb / uniform
 
 
 @dataclass
@@ -56,6 +103,8 @@ class ConfigManager:
     
     def __init__(self):
         self.ga = GAConfig()
+        self.island = IslandConfig()
+        self.lns = LNSConfig()
         self.problem = ProblemConfig()
         self.visualization = VisualizationConfig()
         self.output = OutputConfig()
@@ -69,6 +118,10 @@ class ConfigManager:
                 
             if 'ga' in config_data:
                 self.ga = GAConfig(**config_data['ga'])
+            if 'island' in config_data:
+                self.island = IslandConfig(**config_data['island'])
+            if 'lns' in config_data:
+                self.lns = LNSConfig(**config_data['lns'])
             if 'problem' in config_data:
                 self.problem = ProblemConfig(**config_data['problem'])
             if 'visualization' in config_data:
@@ -91,7 +144,48 @@ class ConfigManager:
                 'crossover_rate': self.ga.crossover_rate,
                 'mutation_rate': self.ga.mutation_rate,
                 'elite_size': self.ga.elite_size,
-                'tournament_size': self.ga.tournament_size
+                'tournament_size': self.ga.tournament_size,
+                'batch_evaluation': self.ga.batch_evaluation,
+                'route_cache_size': self.ga.route_cache_size,
+                'split_decoder': self.ga.split_decoder,
+                'num_workers': self.ga.num_workers,
+                'ga_mode': self.ga.ga_mode,
+                'steady_state_offspring': self.ga.steady_state_offspring,
+                'replacement': self.ga.replacement,
+                'local_search_rate': self.ga.local_search_rate,
+                'local_search_neighbors': self.ga.local_search_neighbors,
+                'charging_placement': self.ga.charging_placement,
+                'reject_clones': self.ga.reject_clones,
+                'construction_share': self.ga.construction_share,
+                'crossover_operator': self.ga.crossover_operator,
+                'repair_method': self.ga.repair_method,
+                'regret_k': self.ga.regret_k,
+                'operator_selection': self.ga.operator_selection,
+                'time_limit': self.ga.time_limit,
+                'max_no_improvement': self.ga.max_no_improvement,
+                'target_cost': self.ga.target_cost,
+                'checkpoint_interval': self.ga.checkpoint_interval,
+                'checkpoint_seconds': self.ga.checkpoint_seconds
+            },
+            'island': {
+                'num_islands': self.island.num_islands,
+                'migration_interval': self.island.migration_interval,
+                'migration_size': self.island.migration_size,
+                'topology': self.island.topology,
+                'seed': self.island.seed
+            },
+            'lns': {
+                'max_iterations': self.lns.max_iterations,
+                'segment_length': self.lns.segment_length,
+                'removal_operators': self.lns.removal_operators,
+                'min_removal': self.lns.min_removal,
+                'max_removal': self.lns.max_removal,
+                'removal_fraction': self.lns.removal_fraction,
+                'max_string_length': self.lns.max_string_length,
+                'regret_k': self.lns.regret_k,
+                'start_temperature': self.lns.start_temperature,
+                'end_temperature': self.lns.end_temperature,
+                'operator_selection': self.lns.operator_selection
             },
             'problem': {
                 'num_customers': self.problem.num_customers,
@@ -132,6 +226,8 @@ class ConfigManager:
   交叉率: {self.ga.crossover_rate}
   变异率: {self.ga.mutation_rate}
   精英保留: {self.ga.elite_size}
+  进化模式: {self.ga.ga_mode}
+  岛屿数量: {self.island.num_islands}
 
 问题设置:
   客户数量: {self.problem.num_customers}
@@ -0,0 +1,156 @@
+"""
+EVRP自适应算子选择
+Per-operator statistics with roulette (ALNS scores) or UCB operator selection
+
+记录每个算子的调用次数、改进率、平均成本变化和CPU时间（time.process_time）。子代评估后按结果给算子打分：
+产生新的全局最优得scores[0]，优于其亲本得scores[1]，是新的不重复个体得scores[2]，
+被当作重复个体拒绝得0（同时参与生成子代的交叉与变异算子都得到这一分数）。
+- uniform: 均匀随机选择（与不做自适应时相同，只统计）。
+- roulette: ALNS的分段权重，每代结束时 w = (1 - reaction) * w + reaction * 本代平均得分，
+  按权重轮盘赌选择，每个算子的概率不低于min_probability。
+- ucb: UCB1，平均奖励（得分 / scores[0]）加探索项
+  exploration * sqrt(2 ln N / n)；调用次数在算子作用于子代时就计入（count），
+  奖励在子代评估后才到达，同一代内也不会一直选同一个算子。
+select()本身不计调用：算子被选中但没有改变子代（如路径太短）时，
+调用方不调用count()，也不记分，避免无效调用拉低改进率和权重。
+"""
+
+import math
+import random
+from typing import Dict, List, Sequence
+
+SELECTION_RULES = ('uniform', 'roulette', 'ucb')
+
+STAT_FIELDS = ('calls', 'outcomes', 'evaluated', 'improved', 'delta', 'time', 'score')
+
+
+class OperatorSelector:
+    """算子统计与自适应选择"""
+    
+    def __init__(self, operators: Sequence[str], tracked: Sequence[str] = (), rule: str = 'uniform',
+                 reaction: float = 0.2, scores: Sequence[float] = (33.0, 9.0, 3.0),
+                 exploration: float = 0.2, min_probability: float = 0.05):
+        if rule not in SELECTION_RULES:
+            raise ValueError(f"未知的算子选择方式: {rule}")
+        self.operators = list(operators)  # 参与选择的算子
+        self.names = self.operators + list(tracked)  # 统计的算子（含只统计不选择的）
+        self.rule = rule
+        self.reaction = reaction  # 轮盘赌权重的反应系数
+        self.scores = tuple(scores)  # 新最优 / 优于亲本 / 新个体的得分
+        self.exploration = exploration  # UCB探索系数
+        self.min_probability = min_probability  # 轮盘赌中每个算子的最小概率
+        self.weights = {name: 1.0 for name in self.operators}
+        self.totals = {name: dict.fromkeys(STAT_FIELDS, 0) for name in self.names}  # 累计统计
+        self.current = {name: dict.fromkeys(STAT_FIELDS, 0) for name in self.names}  # 本代统计
+    
+    def probabilities(self) -> List[float]:
+        """轮盘赌下各算子的选择概率"""
+        total = sum(self.weights.values())
+        floor = self.min_probability
+        scale = 1.0 - floor * len(self.operators)
+        return [floor + scale * self.weights[name] / total for name in self.operators]
+    
+    def select(self) -> str:
+        """选出一个算子（不计调用，算子实际改变子代后由调用方count()）"""
+        if self.rule == 'uniform':
+            return random.choice(self.operators)
+        if self.rule == 'ucb':
+            return self.ucb_select()
+        r = random.random()
+        for name, p in zip(self.operators, self.probabilities()):
+            r -= p
+            if r < 0:
+                return name
+        return self.operators[-1]
+    
+    def ucb_select(self) -> str:
+        """UCB1：未调用过的算子优先，否则取平均奖励加探索项最大者"""
+        for name in self.operators:
+            if self.totals[name]['calls'] == 0:
+                return name
+        total_calls = sum(self.totals[name]['calls'] for name in self.operators)
+        best_name, best_value = None, -math.inf
+        for name in self.operators:
+            stats = self.totals[name]
+            mean = stats['score'] / self.scores[0] / max(stats['outcomes'], 1)
+            value = mean + self.exploration * math.sqrt(2 * math.log(total_calls) / stats['calls'])
+            if value > best_value:
+                best_name, best_value = name, value
+        return best_name
+    
+    def count(self, name: str):
+        """算子实际作用于子代，计入一次调用"""
+        self.totals[name]['calls'] += 1
+        self.current[name]['calls'] += 1
+    
+    def add_time(self, name: str, seconds: float):
+        """累计算子的CPU时间（秒）"""
+        self.totals[name]['time'] += seconds
+        self.current[name]['time'] += seconds
+    
+    def record(self, name: str, delta: float = None, new_best: bool = False, accepted: bool = True):
+        """记录一次子代结果
+        
+        Args:
+            delta: 子代相对亲本的成本变化，None表示子代为重复个体被拒绝
+            new_best: 子代是否优于本代开始时的最优解
+            accepted: 子代是否被接受（大邻域搜索中未被模拟退火接受的候选解得0分）
+        """
+        if delta is None or not accepted:
+            score = 0.0
+        elif new_best:
+            score = self.scores[0]
+        elif delta < 0:
+            score = self.scores[1]
+        else:
+            score = self.scores[2]
+        for stats in (self.totals[name], self.current[name]):
+            stats['outcomes'] += 1
+            stats['score'] += score
+            if delta is not None:
+                stats['evaluated'] += 1
+                stats['delta'] += delta
+                stats['improved'] += delta < 0
+    
+    def end_generation(self) -> Dict[str, Dict[str, float]]:
+        """结束一代：返回本代各算子的统计，轮盘赌规则下更新权重
+        
+        improved为子代优于亲本的比例（被拒绝的重复子代计为未改进），
+        delta为已评估子代的平均成本变化，weight为选择概率。
+        """
+        summary = {}
+        for name in self.names:
+            stats = self.current[name]
+            summary[name] = {
+                'calls': stats['calls'],
+                'improved': stats['improved'] / max(stats['outcomes'], 1),
+                'delta': stats['delta'] / max(stats['evaluated'], 1),
+                'time': stats['time'],
+            }
+            if self.rule == 'roulette' and name in self.weights and stats['outcomes']:
+                self.weights[name] = ((1 - self.reaction) * self.weights[name] +
+                                      self.reaction * stats['score'] / stats['outcomes'])
+            
+        # 选择概率：轮盘赌为更新后的概率，UCB为本代实际选择的比例
+        if self.rule == 'roulette':
+            shares = self.probabilities()
+        elif self.rule == 'ucb':
+            calls = sum(self.current[name]['calls'] for name in self.operators)
+            shares = [self.current[name]['calls'] / max(calls, 1) for name in self.operators]
+        else:
+            shares = [1.0 / len(self.operators)] * len(self.operators)
+        for name, share in zip(self.operators, shares):
+            summary[name]['weight'] = share
+        self.current = {name: dict.fromkeys(STAT_FIELDS, 0) for name in self.names}
+        return summary
+    
+    def state(self) -> dict:
+        """可JSON序列化的状态（用于检查点）"""
+        return {'weights': self.weights, 'totals': self.totals, 'current': self.current}
+    
+    def load_state(self, state: dict):
+        """恢复state()保存的状态"""
+        self.weights.update(state['weights'])
+        for name in self.names:
+            self.totals[name].update(state['totals'].get(name, {}))
+            self.current[name].update(state['current'].get(name, {}))
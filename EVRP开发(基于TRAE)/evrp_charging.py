@@ -0,0 +1,169 @@
+"""
+EVRP充电站布置
+Charging-stop placement for a fixed customer sequence
+
+对应MATLAB版本的RemoveRedundantChargers.m，在子代评估前对被修改过的路径执行：
+- 不可行路径：保持客户顺序，按(位置, 电量档位)动态规划重新布置充电站。
+  每段弧可以直达，或经绕行表中当前电量可达的最优充电站；同一位置同一电量档位
+  只保留成本（距离 + 违反次数 × 惩罚）最小的标签。结果优于原路径时才替换。
+- 可行路径（仅删除的快速路径，可选）：逐个尝试删除充电站，删除后仍可行即删除
+  （资源剖面O(1)判断）。不使用分割解码时多余的充电站是后续变异的电量余量，
+  删除后收敛明显变差，因此默认只处理不可行路径。
+"""
+
+from typing import List, NamedTuple, Tuple
+
+from evrp_solver import (EVRPProblem, EVRPSolution, EVRPEvaluator, NODE_CUSTOMER, NODE_STATION,
+                         VIOLATION_PENALTY)
+
+
+class ChargeLabel(NamedTuple):
+    """动态规划标签"""
+    cost: float       # 距离 + 违反次数 × 惩罚（不含返回配送中心）
+    time: float       # 离开当前节点的时间
+    battery: float    # 离开当前节点时的电量
+    load: float       # 累计载重
+    node: int         # 当前节点索引
+    station: int      # 到达当前节点前经过的充电站，-1表示直达
+    parent: object    # 前一个标签
+
+
+class ChargingPlacement:
+    """充电站布置算子"""
+    
+    def __init__(self, problem: EVRPProblem, evaluator: EVRPEvaluator = None, battery_levels: int = 20):
+        self.problem = problem.compile()
+        self.evaluator = evaluator if evaluator is not None else EVRPEvaluator(problem)
+        self.battery_levels = battery_levels  # 电量离散档位数
+        self.detour_table = self.problem.detour_table()
+        self.demands = self.problem.demands.tolist()
+        self.service_times = self.problem.service_times.tolist()
+        self.tw_early = self.problem.tw_early.tolist()
+        self.tw_late = self.problem.tw_late.tolist()
+        self.charging_rates = self.problem.charging_rates.tolist()
+    
+    def improve(self, solution: EVRPSolution, remove_redundant: bool = False) -> int:
+        """处理解中被修改过的路径（共享的路径已处理过，直接跳过），返回改变的路径数
+
+        Args:
+            remove_redundant: 是否对可行路径执行删除多余充电站的快速路径
+        """
+        changed = 0
+        for r, route in enumerate(solution.routes):
+            if solution._owned is not None and route not in solution._owned:
+                continue
+            profile = self.evaluator.route_profile(route)
+            if profile.violations[-1] == 0:
+                if remove_redundant and self.remove_redundant(solution, r):
+                    changed += 1
+                continue
+                
+            customers = [node.index for node in route.sequence if node.node_type == NODE_CUSTOMER]
+            cost, sequence = self.optimal_placement(customers)
+            current = profile.distance[-1] + VIOLATION_PENALTY * profile.violations[-1]
+            if cost < current - 1e-9:
+                route = solution.mutable_route(r)
+                route.sequence = [self.problem.nodes[j] for j in sequence]
+                route.invalidate()
+                changed += 1
+            
+        if changed:
+            solution.routes = [route for route in solution.routes if route.sequence]
+        return changed
+    
+    def remove_redundant(self, solution: EVRPSolution, r: int) -> bool:
+        """快速路径：删除可行路径中删去后仍可行的充电站"""
+        route = solution.routes[r]
+        changed = False
+        p = 0
+        while p < len(route.sequence):
+            if (route.sequence[p].node_type == NODE_STATION and
+                    self.evaluator.evaluate_removal(route, p).feasible):
+                route = solution.mutable_route(r)
+                del route.sequence[p]
+                route.invalidate()
+                changed = True
+            else:
+                p += 1
+        return changed
+    
+    def extend(self, label: ChargeLabel, j: int, station: int) -> ChargeLabel:
+        """从标签出发访问客户j，station >= 0时先到该充电站充满电（计算规则与评估器一致）"""
+        problem = self.problem
+        prev, time, battery, load = label.node, label.time, label.battery, label.load
+        distance = 0.0
+        violations = 0
+        
+        if station >= 0:
+            leg = problem.distance_rows[prev][station]
+            energy_needed = leg * problem.consumption_rate
+            if battery < energy_needed:
+                violations += 1
+            distance += leg
+            time += leg / problem.speed
+            battery -= energy_needed
+            time += (problem.vehicle_battery - battery) / self.charging_rates[station]
+            battery = problem.vehicle_battery
+            prev = station
+            
+        leg = problem.distance_rows[prev][j]
+        energy_needed = leg * problem.consumption_rate
+        if battery < energy_needed:
+            violations += 1
+        if load + self.demands[j] > problem.vehicle_capacity:
+            violations += 1
+        load += self.demands[j]
+        time += leg / problem.speed
+        battery -= energy_needed
+        if not (self.tw_early[j] <= time <= self.tw_late[j]):
+            violations += 1
+        time += self.service_times[j]
+        distance += leg
+        return ChargeLabel(label.cost + distance + VIOLATION_PENALTY * violations,
+                           time, battery, load, j, station, label)
+    
+    def battery_level(self, battery: float) -> int:
+        """电量所在的离散档位，负电量单独一档"""
+        if battery < 0:
+            return -1
+        return min(int(battery / self.problem.vehicle_battery * self.battery_levels),
+                   self.battery_levels - 1)
+    
+    def optimal_placement(self, customers: List[int]) -> Tuple[float, List[int]]:
+        """给定客户顺序，求充电站的最优布置
+        
+        Returns:
+            (路径成本, 含充电站的节点索引序列)
+        """
+        problem = self.problem
+        depot = problem.depot.index
+        if not customers:
+            return 0.0, []
+            
+        start = ChargeLabel(0.0, 0.0, problem.vehicle_battery, 0.0, depot, -1, None)
+        labels = {self.battery_level(start.battery): start}
+        for j in customers:
+            next_labels = {}
+            for label in labels.values():
+                candidates = [self.extend(label, j, -1)]
+                station = self.detour_table.best_reachable(label.node, j, label.battery)
+                if station >= 0:
+                    candidates.append(self.extend(label, j, station))
+                for candidate in candidates:
+                    level = self.battery_level(candidate.battery)
+                    best = next_labels.get(level)
+                    if best is None or (candidate.cost, candidate.time) < (best.cost, best.time):
+                        next_labels[level] = candidate
+            labels = next_labels
+            
+        distance_rows = problem.distance_rows
+        label = min(labels.values(), key=lambda l: l.cost + distance_rows[l.node][depot])
+        cost = label.cost + distance_rows[label.node][depot]
+        sequence = []
+        while label.parent is not None:
+            sequence.append(label.node)
+            if label.station >= 0:
+                sequence.append(label.station)
+            label = label.parent
+        sequence.reverse()
+        return cost, sequence
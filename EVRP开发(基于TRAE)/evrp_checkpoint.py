@@ -0,0 +1,139 @@
+"""
+EVRP遗传算法检查点
+Compact binary checkpoint / resume of the full GA state
+
+检查点为一个npz文件：种群和最优解以紧凑数组保存（节点索引 + 路径指标），
+同时保存路径评估缓存（按LRU顺序）、random与numpy的随机数状态、
+收敛历史、计数器和自适应算子选择的统计，恢复后继续运行的结果与不中断运行完全相同。
+"""
+
+import json
+import os
+import random
+from typing import List
+
+import numpy as np
+
+from evrp_solver import EVRPSolution, CompactSolution, RouteMetrics, RouteCache
+
+CHECKPOINT_VERSION = 1
+
+
+def _pack_solutions(solutions: List[EVRPSolution]) -> dict:
+    """把一组解打包为扁平数组"""
+    compacts = [CompactSolution.from_solution(solution) for solution in solutions]
+    return {
+        'tour': np.concatenate([c.tour for c in compacts] + [np.empty(0, dtype=np.int32)]),
+        'route_lengths': np.concatenate([np.diff(c.offsets) for c in compacts] +
+                                        [np.empty(0, dtype=np.int32)]).astype(np.int32),
+        'routes_per_solution': np.array([c.num_routes for c in compacts], dtype=np.int32),
+        'route_metrics': np.concatenate([c.metrics for c in compacts] +
+                                        [np.empty((0, len(RouteMetrics._fields)))]),
+        'solution_values': np.array([[s.total_cost, s.fitness, s.is_feasible] for s in solutions],
+                                    dtype=float).reshape(len(solutions), 3),
+    }
+
+
+def _unpack_solutions(problem, data) -> List[EVRPSolution]:
+    """由扁平数组还原一组解（指标直接写回，不重新评估）"""
+    solutions = []
+    route_offsets = np.concatenate([[0], np.cumsum(data['route_lengths'])]).astype(np.int64)
+    first_route = 0
+    for num_routes, (total_cost, fitness, is_feasible) in zip(data['routes_per_solution'].tolist(),
+                                                                data['solution_values'].tolist()):
+        last_route = first_route + num_routes
+        start = route_offsets[first_route]
+        compact = CompactSolution(data['tour'][start:route_offsets[last_route]],
+                                  route_offsets[first_route:last_route + 1] - start,
+                                  data['route_metrics'][first_route:last_route])
+        compact.total_cost = total_cost
+        compact.fitness = fitness
+        compact.is_feasible = bool(is_feasible)
+        solutions.append(compact.to_solution(problem))
+        first_route = last_route
+    return solutions
+
+
+def _pack_cache(cache: RouteCache) -> dict:
+    """按LRU顺序保存缓存条目"""
+    keys = list(cache.entries.keys())
+    return {
+        'cache_keys': np.array([j for key in keys for j in key], dtype=np.int32),
+        'cache_lengths': np.array([len(key) for key in keys], dtype=np.int32),
+        'cache_metrics': np.array(list(cache.entries.values()), dtype=float).reshape(
+            len(keys), len(RouteMetrics._fields)),
+    }
+
+
+def _unpack_cache(cache: RouteCache, data, counters: dict):
+    """还原缓存条目和计数器"""
+    cache.entries.clear()
+    keys = data['cache_keys'].tolist()
+    start = 0
+    for length, values in zip(data['cache_lengths'].tolist(), data['cache_metrics'].tolist()):
+        key = tuple(keys[start:start + length])
+        cache.entries[key] = RouteMetrics(*values[:4], int(values[4]), int(values[5]), values[6])
+        start += length
+    cache.hits = counters['hits']
+    cache.misses = counters['misses']
+    cache.evictions = counters['evictions']
+
+
+def save_checkpoint(ga, path: str, elapsed: float = 0.0, last_improvement: int = -1):
+    """保存遗传算法的完整状态；先写临时文件再替换，避免中断时损坏已有检查点"""
+    py_version, py_state, py_gauss = random.getstate()
+    np_name, np_keys, np_pos, np_has_gauss, np_gauss = np.random.get_state()
+    
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'num_nodes': len(ga.problem.nodes),
+        'population_size': len(ga.population),
+        'generation_history': ga.generation_history,
+        'operator_selector': ga.operator_selector.state(),
+        'evaluations': ga.evaluations,
+        'cache_counters': ga.evaluator.cache.stats(),
+        'elapsed': elapsed,
+        'last_improvement': last_improvement,
+        'python_random': [py_version, py_gauss],
+        'numpy_random': [np_name, int(np_pos), int(np_has_gauss), float(np_gauss)],
+    }
+    
+    arrays = _pack_solutions(ga.population + [ga.best_solution])
+    arrays.update(_pack_cache(ga.evaluator.cache))
+    arrays['python_random_state'] = np.array(py_state, dtype=np.int64)
+    arrays['numpy_random_keys'] = np.asarray(np_keys, dtype=np.uint32)
+    arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+    
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(ga, path: str) -> dict:
+    """把检查点恢复到遗传算法对象，返回元数据（含elapsed、last_improvement）"""
+    problem = ga.problem.compile()
+    with np.load(path) as data:
+        meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+        if meta['version'] != CHECKPOINT_VERSION:
+            raise ValueError(f"不支持的检查点版本: {meta['version']}")
+        if meta['num_nodes'] != len(problem.nodes):
+            raise ValueError("检查点与当前问题实例的节点数不一致")
+            
+        solutions = _unpack_solutions(problem, data)
+        _unpack_cache(ga.evaluator.cache, data, meta['cache_counters'])
+        py_state = tuple(data['python_random_state'].tolist())
+        np_keys = data['numpy_random_keys'].copy()
+        
+    ga.population = solutions[:meta['population_size']]
+    ga.best_solution = solutions[meta['population_size']]
+    ga.generation_history = meta['generation_history']
+    if 'operator_selector' in meta:
+        ga.operator_selector.load_state(meta['operator_selector'])
+    ga.evaluations = meta['evaluations']
+    
+    py_version, py_gauss = meta['python_random']
+    random.setstate((py_version, py_state, py_gauss))
+    np_name, np_pos, np_has_gauss, np_gauss = meta['numpy_random']
+    np.random.set_state((np_name, np_keys, np_pos, np_has_gauss, np_gauss))
+    return meta
@@ -0,0 +1,173 @@
+"""
+EVRP构造启发式
+Clarke-Wright savings and sweep constructors for initial populations
+
+- 节约法：节约值s(i,j) = d(0,i) + d(0,j) - d(i,j)用NumPy在距离矩阵上一次算出，
+  只保留互为近邻的客户对；按节约值从大到小合并端点相接的路径，
+  合并后的路径按分割解码器的规则计算成本（电量不足时插入最优绕行充电站，
+  违反约束计入惩罚），比两条路径分开时更低才合并。
+- 扫描法：按客户相对配送中心的极角把客户装满载重划成扇区，扇区内按时间窗开始时间
+  排序，拼接成巨型路径后用分割解码器最优切分为路径。
+随机化变体（节约值乘以随机扰动、随机起始角度和方向）用于生成多样的初始个体。
+"""
+
+import math
+import random
+from typing import List
+
+import numpy as np
+
+from evrp_solver import EVRPProblem, EVRPSolution
+from evrp_split import SplitDecoder
+
+
+class InitialConstructor:
+    """节约法与扫描法构造器"""
+    
+    def __init__(self, problem: EVRPProblem, decoder: SplitDecoder = None, num_neighbors: int = 40):
+        self.problem = problem.compile()
+        self.decoder = decoder if decoder is not None else SplitDecoder(problem)
+        self.num_neighbors = num_neighbors  # 每个客户参与合并的近邻数
+        self.pairs, self.pair_savings = self.savings_list()
+        self.angles = self.polar_angles()
+    
+    def savings_list(self):
+        """近邻客户对及其节约值（节约值为正的才保留）
+        
+        Returns:
+            (客户对数组[K, 2], 节约值数组[K])
+        """
+        problem = self.problem
+        customers = problem.customer_indices
+        n = len(customers)
+        distances = problem.distance_matrix
+        depot = problem.depot.index
+        
+        from_depot = distances[depot, customers]
+        savings = from_depot[:, None] + from_depot[None, :] - distances[np.ix_(customers, customers)]
+        
+        # 只保留互为近邻的客户对（上三角）
+        index = problem.spatial_index()
+        mask = np.zeros((n, n), dtype=bool)
+        for row, i in enumerate(customers.tolist()):
+            mask[row, index.nearest_customers(i, self.num_neighbors) - 1] = True
+        mask |= mask.T
+        mask &= np.triu(np.ones((n, n), dtype=bool), k=1)
+        mask &= savings > 0
+        
+        rows, cols = np.nonzero(mask)
+        pairs = np.stack([customers[rows], customers[cols]], axis=1)
+        return pairs, savings[rows, cols]
+    
+    def polar_angles(self) -> np.ndarray:
+        """各客户相对配送中心的极角（按稠密索引，配送中心与充电站为0）"""
+        problem = self.problem
+        offsets = problem.coordinates - problem.coordinates[problem.depot.index]
+        angles = np.zeros(len(problem.nodes))
+        customers = problem.customer_indices
+        angles[customers] = np.arctan2(offsets[customers, 1], offsets[customers, 0])
+        return angles
+    
+    def route_cost(self, customers: List[int]) -> float:
+        """按分割解码器规则计算一条路径的成本"""
+        decoder = self.decoder
+        state = decoder.start_state()
+        for j in customers:
+            state = decoder.extend(state, j)
+        return decoder.route_cost(state)
+    
+    def build_solution(self, routes: List[List[int]]) -> EVRPSolution:
+        """由客户序列构建解（插入充电站，未评估）"""
+        solution = EVRPSolution(self.problem)
+        for customers in routes:
+            solution.routes.append(self.decoder.build_route(customers))
+        return solution
+    
+    def savings(self, noise: float = 0.0) -> EVRPSolution:
+        """Clarke-Wright并行节约法
+        
+        Args:
+            noise: 节约值的随机扰动幅度，0为确定性版本
+        """
+        problem = self.problem
+        capacity = problem.vehicle_capacity
+        demands = self.decoder.demands
+        savings = self.pair_savings
+        if noise > 0:
+            savings = savings * np.random.uniform(1 - noise, 1 + noise, len(savings))
+        order = np.argsort(-savings, kind='stable')
+        
+        routes = {int(i): [int(i)] for i in problem.customer_indices}  # 路径编号 -> 客户序列
+        route_of = {i: i for i in routes}  # 客户 -> 所在路径编号
+        loads = {i: demands[i] for i in routes}
+        costs = {i: self.route_cost(routes[i]) for i in routes}
+        
+        for i, j in self.pairs[order].tolist():
+            a, b = route_of[i], route_of[j]
+            if a == b or loads[a] + loads[b] > capacity:
+                continue
+            first, second = routes[a], routes[b]
+            # i和j都必须是路径端点，拼接为first ... i, j ... second
+            if first[-1] != i:
+                if first[0] != i:
+                    continue
+                first = first[::-1]
+            if second[0] != j:
+                if second[-1] != j:
+                    continue
+                second = second[::-1]
+                
+            merged = first + second
+            cost = self.route_cost(merged)
+            if cost >= costs[a] + costs[b] - 1e-9:
+                continue
+            routes[a] = merged
+            loads[a] += loads[b]
+            costs[a] = cost
+            for customer in routes.pop(b):
+                route_of[customer] = a
+            del loads[b], costs[b]
+            
+        return self.build_solution(list(routes.values()))
+    
+    def sweep(self, randomize: bool = False) -> EVRPSolution:
+        """扫描法：按极角把客户装满载重划成扇区，扇区内按时间窗开始时间排序，再最优分割
+        
+        Args:
+            randomize: 是否随机选择起始角度和扫描方向
+        """
+        problem = self.problem
+        customers = problem.customer_indices
+        angles = self.angles[customers]
+        if randomize:
+            start = random.uniform(-math.pi, math.pi)
+            angles = np.mod(angles - start, 2 * math.pi)
+            if random.random() < 0.5:
+                angles = -angles
+        order = customers[np.argsort(angles, kind='stable')].tolist()
+        
+        demands = self.decoder.demands
+        tw_early = self.decoder.tw_early
+        tour = []
+        sector = []
+        load = 0.0
+        for j in order:
+            if sector and load + demands[j] > problem.vehicle_capacity:
+                tour.extend(sorted(sector, key=lambda c: tw_early[c]))
+                sector = []
+                load = 0.0
+            sector.append(j)
+            load += demands[j]
+        tour.extend(sorted(sector, key=lambda c: tw_early[c]))
+        return self.decoder.decode(tour)
+    
+    def generate(self, count: int, noise: float = 0.1) -> List[EVRPSolution]:
+        """生成count个构造解：先是确定性的节约法与扫描法，其余交替使用随机化变体"""
+        solutions = []
+        for k in range(count):
+            randomized = k >= 2
+            if k % 2 == 0:
+                solutions.append(self.savings(noise if randomized else 0.0))
+            else:
+                solutions.append(self.sweep(randomized))
+        return solutions
@@ -0,0 +1,149 @@
+"""
+EVRP巨型路径交叉
+Order-based crossovers on giant tours: OX, PMX, edge recombination, route exchange
+
+亲本先去掉充电站展开为客户排列（巨型路径），交叉只重排客户，子代按构造就是
+合法排列（每个客户恰好出现一次），再用分割解码器最优切分为路径并插入充电绕行，
+不需要修复步骤。展开前各路径按其客户重心相对配送中心的极角排序，使两个亲本的
+巨型路径在空间上对齐（不排序时子代质量明显变差）。
+- ox: 顺序交叉，保留亲本1的一段，其余客户按亲本2的循环顺序填充。
+- pmx: 部分映射交叉，保留亲本1的一段，段外位置沿映射链取亲本2的客户。
+- erx: 边重组交叉（edge recombination），从两个亲本的邻接边并集中组装子代，
+  每步走向剩余邻居最少的邻接客户；是边组装交叉（EAX）的轻量版本，
+  不做AB环分解与子回路合并。
+- srex: 路径交换（SREX风格），把亲本2的若干条完整路径作为整块插入亲本1的
+  路径边界处，亲本1中这些客户删去，其余顺序不变。
+"""
+
+import random
+from typing import List
+
+import numpy as np
+
+from evrp_solver import EVRPProblem, EVRPSolution, NODE_CUSTOMER
+from evrp_split import SplitDecoder
+
+CROSSOVER_OPERATORS = ('ox', 'pmx', 'erx', 'srex')
+
+
+def order_crossover(tour1: List[int], tour2: List[int]) -> List[int]:
+    """顺序交叉（OX）"""
+    n = len(tour1)
+    i, j = sorted(random.sample(range(n + 1), 2))
+    segment = tour1[i:j]
+    kept = set(segment)
+    rest = [c for c in tour2[j:] + tour2[:j] if c not in kept]
+    # rest依次填入j..n-1，再填入0..i-1
+    return rest[n - j:] + segment + rest[:n - j]
+
+
+def partially_mapped_crossover(tour1: List[int], tour2: List[int]) -> List[int]:
+    """部分映射交叉（PMX）"""
+    n = len(tour1)
+    i, j = sorted(random.sample(range(n + 1), 2))
+    mapping = {tour1[k]: tour2[k] for k in range(i, j)}
+    child = []
+    for k in range(n):
+        if i <= k < j:
+            child.append(tour1[k])
+            continue
+        c = tour2[k]
+        while c in mapping:
+            c = mapping[c]
+        child.append(c)
+    return child
+
+
+def edge_recombination(tour1: List[int], tour2: List[int]) -> List[int]:
+    """边重组交叉（ERX），巨型路径视为环"""
+    adjacency = {c: set() for c in tour1}
+    for tour in (tour1, tour2):
+        n = len(tour)
+        for k, c in enumerate(tour):
+            adjacency[c].add(tour[k - 1])
+            adjacency[c].add(tour[(k + 1) % n])
+    for c in adjacency:
+        adjacency[c].discard(c)
+        
+    unvisited = list(tour1)
+    position = {c: k for k, c in enumerate(unvisited)}
+    child = []
+    current = tour1[0]
+    while True:
+        child.append(current)
+        # 从未访问列表中O(1)删除
+        k = position.pop(current)
+        last = unvisited.pop()
+        if last != current:
+            unvisited[k] = last
+            position[last] = k
+        neighbors = sorted(adjacency.pop(current))
+        for c in neighbors:
+            adjacency[c].discard(current)
+        if not unvisited:
+            return child
+            
+        # 走向剩余邻居最少的邻接客户，没有邻接客户时随机选一个未访问客户
+        if neighbors:
+            fewest = min(len(adjacency[c]) for c in neighbors)
+            current = random.choice([c for c in neighbors if len(adjacency[c]) == fewest])
+        else:
+            current = random.choice(unvisited)
+
+
+def route_exchange(routes1: List[List[int]], routes2: List[List[int]]) -> List[int]:
+    """路径交换（SREX风格）：亲本2的若干条连续路径整块插入亲本1的一个路径边界"""
+    count = random.randint(1, max(1, len(routes2) // 2))
+    start = random.randint(0, len(routes2) - count)
+    block = [c for route in routes2[start:start + count] for c in route]
+    moved = set(block)
+    
+    boundary = random.randint(0, len(routes1))
+    head = [c for route in routes1[:boundary] for c in route if c not in moved]
+    tail = [c for route in routes1[boundary:] for c in route if c not in moved]
+    return head + block + tail
+
+
+class GiantTourCrossover:
+    """巨型路径交叉算子：亲本展开为客户排列，交叉后分割解码"""
+    
+    def __init__(self, problem: EVRPProblem, decoder: SplitDecoder = None, operator: str = 'ox'):
+        if operator not in CROSSOVER_OPERATORS:
+            raise ValueError(f"未知的交叉算子: {operator}")
+        self.problem = problem.compile()
+        self.decoder = decoder if decoder is not None else SplitDecoder(problem)
+        self.operator = operator
+        self.offsets = self.problem.coordinates - self.problem.coordinates[self.problem.depot.index]
+    
+    def customer_routes(self, solution: EVRPSolution) -> List[List[int]]:
+        """各路径的客户索引序列（去掉充电站和空路径），按客户重心的极角排序"""
+        routes = []
+        for route in solution.routes:
+            customers = [node.index for node in route.sequence if node.node_type == NODE_CUSTOMER]
+            if customers:
+                routes.append(customers)
+        if len(routes) > 1:
+            centers = np.array([self.offsets[customers].mean(axis=0) for customers in routes])
+            angles = np.arctan2(centers[:, 1], centers[:, 0])
+            routes = [routes[k] for k in np.argsort(angles, kind='stable')]
+        return routes
+    
+    def child_tour(self, parent1: EVRPSolution, parent2: EVRPSolution) -> List[int]:
+        """由两个亲本生成子代的巨型路径"""
+        routes1 = self.customer_routes(parent1)
+        routes2 = self.customer_routes(parent2)
+        if self.operator == 'srex':
+            return route_exchange(routes1, routes2)
+        tour1 = [c for route in routes1 for c in route]
+        tour2 = [c for route in routes2 for c in route]
+        if len(tour1) < 2:
+            return tour1
+        if self.operator == 'ox':
+            return order_crossover(tour1, tour2)
+        if self.operator == 'pmx':
+            return partially_mapped_crossover(tour1, tour2)
+        return edge_recombination(tour1, tour2)
+    
+    def cross(self, parent1: EVRPSolution, parent2: EVRPSolution) -> EVRPSolution:
+        """产生一个子代（未评估）"""
+        return self.decoder.decode(self.child_tour(parent1, parent2))
@@ -0,0 +1,132 @@
+"""
+EVRP充电绕行表
+Precomputed best charging detour i -> station -> j
+
+对每个有序节点对(i, j)预先求出绕行距离d(i,s) + d(s,j)最短的充电站s，
+约束为满电时能从i到达s、充满后能从s到达j（距离相同时索引小者优先）。
+查询时若当前电量也能到达该站，它就是所有可达充电站中的最优者，一次查表即可；
+否则退回到只扫描电量半径内的充电站。
+节点数较多时只为每个节点的近邻客户和配送中心保存表项（稀疏表），
+其余节点对在查询时现场计算。
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from evrp_solver import EVRPProblem
+
+
+class DetourEntry(NamedTuple):
+    """节点对(i, j)之间经充电站绕行的信息"""
+    station: int            # 充电站索引，-1表示没有可用充电站
+    extra_distance: float   # 相对直达多出的距离
+    extra_energy: float     # 多出的能耗
+    extra_time: float       # 多出的行驶时间（不含充电时间）
+
+
+class DetourTable:
+    """最优充电绕行表"""
+    
+    def __init__(self, problem: EVRPProblem, dense_limit: int = 1500, num_neighbors: int = 30):
+        problem = problem.compile()
+        self.problem = problem
+        self.dense = len(problem.nodes) <= dense_limit  # 节点数不超过dense_limit时保存完整的N×N表
+        self.num_neighbors = num_neighbors  # 稀疏表中每个节点保存的近邻客户数
+        if self.dense:
+            self.build_dense()
+        else:
+            self.build_sparse()
+    
+    def feasible_detours(self, i, j) -> tuple:
+        """所有充电站作为i到j的绕行点时的绕行距离，不满足满电可达约束的为inf
+        
+        i为标量，j为索引数组；返回(绕行距离矩阵[站, j], 充电站索引)。
+        """
+        problem = self.problem
+        stations = problem.station_indices
+        battery = problem.vehicle_battery
+        detour = problem.distance_matrix[i, stations][:, None] + problem.distance_matrix[np.ix_(stations, j)]
+        reachable = ((problem.energy_matrix[i, stations] <= battery)[:, None] &
+                     (problem.energy_matrix[np.ix_(stations, j)] <= battery))
+        return np.where(reachable, detour, np.inf), stations
+    
+    def build_dense(self):
+        """逐个充电站更新N×N的最短绕行（严格小于才更新，并列时保留索引小的站）"""
+        problem = self.problem
+        n = len(problem.nodes)
+        battery = problem.vehicle_battery
+        distances = problem.distance_matrix
+        self.station = np.full((n, n), -1, dtype=np.int32)
+        self.detour = np.full((n, n), np.inf)
+        
+        for s in problem.station_indices.tolist():
+            detour = distances[:, s][:, None] + distances[s, :][None, :]
+            reachable = ((problem.energy_matrix[:, s] <= battery)[:, None] &
+                         (problem.energy_matrix[s, :] <= battery)[None, :])
+            better = reachable & (detour < self.detour)
+            self.detour[better] = detour[better]
+            self.station[better] = s
+    
+    def build_sparse(self):
+        """只为每个节点的近邻客户和配送中心保存表项"""
+        problem = self.problem
+        index = problem.spatial_index()
+        depot = problem.depot.index
+        self.rows = [{} for _ in problem.nodes]
+        if len(problem.station_indices) == 0:
+            return
+        for i, row in enumerate(self.rows):
+            targets = np.append(index.nearest_customers(i, self.num_neighbors), depot)
+            detour, stations = self.feasible_detours(i, targets)
+            best = detour.argmin(axis=0)
+            values = detour[best, np.arange(len(targets))]
+            for j, k, value in zip(targets.tolist(), best.tolist(), values.tolist()):
+                row[j] = (int(stations[k]), value) if value < np.inf else (-1, value)
+    
+    def lookup(self, i: int, j: int) -> tuple:
+        """(充电站, 绕行总距离)；没有可用充电站时为(-1, inf)"""
+        if self.dense:
+            return int(self.station[i, j]), float(self.detour[i, j])
+        entry = self.rows[i].get(j)
+        if entry is not None:
+            return entry
+        if len(self.problem.station_indices) == 0:
+            return -1, float('inf')
+        detour, stations = self.feasible_detours(i, np.array([j]))
+        k = int(detour[:, 0].argmin())
+        if detour[k, 0] == np.inf:
+            return -1, float('inf')
+        return int(stations[k]), float(detour[k, 0])
+    
+    def best_station(self, i: int, j: int) -> int:
+        """满电约束下i到j绕行最短的充电站"""
+        return self.lookup(i, j)[0]
+    
+    def entry(self, i: int, j: int) -> DetourEntry:
+        """节点对(i, j)的绕行信息"""
+        station, detour = self.lookup(i, j)
+        if station < 0:
+            return DetourEntry(-1, float('inf'), float('inf'), float('inf'))
+        problem = self.problem
+        extra = detour - problem.distance_rows[i][j]
+        return DetourEntry(station, extra, extra * problem.consumption_rate, extra / problem.speed)
+    
+    def best_reachable(self, i: int, j: int, battery: float) -> int:
+        """以当前电量从i可达、充满后能到达j的绕行最短的充电站；没有则返回-1"""
+        problem = self.problem
+        station, _ = self.lookup(i, j)
+        if station < 0:
+            return -1
+        if problem.distance_rows[i][station] * problem.consumption_rate <= battery:
+            return station  # 满电约束下的最优站当前也可达，必为可达站中的最优
+            
+        stations = problem.spatial_index().reachable_stations(i, battery)
+        if len(stations) == 0:
+            return -1
+        detour = problem.distance_matrix[i, stations] + problem.distance_matrix[stations, j]
+        reachable = ((problem.energy_matrix[i, stations] <= battery) &
+                     (problem.energy_matrix[stations, j] <= problem.vehicle_battery))
+        if not reachable.any():
+            return -1
+        return int(stations[np.argmin(np.where(reachable, detour, np.inf))])
@@ -0,0 +1,227 @@
+"""
+EVRP岛屿模型遗传算法
+Island-model GA with periodic migration
+
+每个岛屿是一个独立进程中的EVRPGeneticAlgorithm种群，每隔M代同步一次：
+各岛把最优的k个个体以紧凑格式（int32巨型路径 + 路径偏移）发给主进程，
+主进程按环形或随机拓扑转发，迁入个体替换目标岛上最差的个体。
+"""
+
+import math
+import multiprocessing as mp
+import random
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from evrp_solver import (EVRPProblem, EVRPSolution, EVRPGeneticAlgorithm, EVRPEvaluator,
+                         CompactSolution, Route)
+
+
+def encode_migrants(solutions: List[EVRPSolution]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """把个体编码为(巨型路径, 偏移)数组对，只传输节点索引"""
+    migrants = []
+    for solution in solutions:
+        compact = CompactSolution.from_solution(solution)
+        migrants.append((compact.tour, compact.offsets))
+    return migrants
+
+
+def decode_migrants(problem: EVRPProblem, migrants: List[Tuple[np.ndarray, np.ndarray]]) -> List[EVRPSolution]:
+    """由数组对还原个体（未评估）"""
+    problem.compile()
+    solutions = []
+    for tour, offsets in migrants:
+        solution = EVRPSolution(problem)
+        for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+            route = Route(problem)
+            route.sequence = [problem.nodes[j] for j in tour[start:end].tolist()]
+            solution.routes.append(route)
+        solutions.append(solution)
+    return solutions
+
+
+def immigrate(ga: EVRPGeneticAlgorithm, migrants: List[EVRPSolution]):
+    """迁入个体替换种群中最差的个体，并更新岛内最优解"""
+    if not migrants:
+        return
+    ga.evaluate_population(migrants)
+    ga.population = ga.population[:len(ga.population) - len(migrants)] + migrants
+    ga.population.sort(key=lambda x: x.total_cost)
+    if ga.population[0].total_cost < ga.best_solution.total_cost:
+        ga.best_solution = ga.population[0].copy()
+
+
+def _island_worker(conn, problem: EVRPProblem, ga_params: Dict, seed: int):
+    """岛屿进程：按主进程指令进化若干代并交换迁移个体"""
+    random.seed(seed)
+    np.random.seed(seed)
+    ga = EVRPGeneticAlgorithm(problem, **ga_params)
+    ga.create_initial_population()
+    
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        generations, migration_size, migrants = message
+        
+        immigrate(ga, decode_migrants(problem, migrants))
+        start = len(ga.generation_history)
+        for _ in range(generations):
+            ga.evolve()
+            
+        emigrants = encode_migrants(ga.population[:migration_size])
+        best = encode_migrants([ga.best_solution])[0]
+        conn.send((emigrants, best, ga.generation_history[start:]))
+        
+    ga.close()
+    conn.close()
+
+
+class EVRPIslandModel:
+    """岛屿模型驱动器
+    
+    接口与EVRPGeneticAlgorithm一致：solve()返回全局最优解，
+    generation_history为各岛逐代汇总的收敛历史，island_histories为各岛的历史。
+    """
+    
+    def __init__(self, problem: EVRPProblem, ga_params: Dict = None, num_islands: int = 4,
+                 migration_interval: int = 20, migration_size: int = 2,
+                 topology: str = 'ring', seed: int = 0):
+        if topology not in ('ring', 'random'):
+            raise ValueError(f"未知的迁移拓扑: {topology}")
+            
+        self.problem = problem.compile()
+        self.ga_params = dict(ga_params or {})
+        self.ga_params['num_workers'] = 0  # 岛屿进程内串行评估
+        self.max_generations = self.ga_params.get('max_generations', 1000)
+        self.num_islands = num_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.seed = seed
+        self.rng = random.Random(seed)  # 随机拓扑的目标选择
+        
+        self.evaluator = EVRPEvaluator(problem)
+        self.best_solution = None
+        self.island_best = [None] * num_islands
+        self.island_histories = [[] for _ in range(num_islands)]
+        self.generation_history = []
+        self.stop_reason = None
+    
+    def migration_targets(self) -> List[int]:
+        """第i个岛的迁出个体发往的岛"""
+        n = self.num_islands
+        if self.topology == 'ring':
+            return [(i + 1) % n for i in range(n)]
+        return [self.rng.choice([j for j in range(n) if j != i]) if n > 1 else i
+                for i in range(n)]
+    
+    def solve(self, time_limit: float = None, max_no_improvement: int = None,
+              target_cost: float = None) -> EVRPSolution:
+        """求解EVRP问题；终止条件与EVRPGeneticAlgorithm.solve相同，在每次迁移后检查"""
+        start_time = time.time()
+        self.stop_reason = 'max_generations'
+        print(f"启动{self.num_islands}个岛屿进程，每{self.migration_interval}代迁移"
+              f"{self.migration_size}个个体（{self.topology}拓扑）...")
+            
+        connections = []
+        processes = []
+        for i in range(self.num_islands):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=_island_worker,
+                                 args=(child_conn, self.problem, self.ga_params, self.seed + i))
+            process.start()
+            connections.append(parent_conn)
+            processes.append(process)
+            
+        completed = False
+        try:
+            inbox = [[] for _ in range(self.num_islands)]
+            epochs = max(1, math.ceil(self.max_generations / self.migration_interval))
+            for epoch in range(epochs):
+                generations = max(0, min(self.migration_interval,
+                                         self.max_generations - epoch * self.migration_interval))
+                for i, conn in enumerate(connections):
+                    conn.send((generations, self.migration_size, inbox[i]))
+                    
+                inbox = [[] for _ in range(self.num_islands)]
+                targets = self.migration_targets()
+                for i, conn in enumerate(connections):
+                    emigrants, best, history = conn.recv()
+                    inbox[targets[i]].extend(emigrants)
+                    self.island_best[i] = best
+                    self.island_histories[i].extend(history)
+                    
+                self._record_generations(generations)
+                if self.generation_history:
+                    print(f"第{len(self.generation_history)}代迁移: "
+                          f"最优成本 = {self.generation_history[-1]['best_cost']:.2f}")
+                    
+                stop_reason = self._stop_reason(start_time, time_limit, max_no_improvement, target_cost)
+                if stop_reason is not None:
+                    self.stop_reason = stop_reason
+                    break
+            completed = True
+        finally:
+            self._shutdown(connections, processes, completed)
+            
+        self.best_solution = self._select_best()
+        print(f"最终最优成本: {self.best_solution.total_cost:.2f}")
+        return self.best_solution
+    
+    def _shutdown(self, connections: List, processes: List, completed: bool, timeout: float = 10.0):
+        """结束岛屿进程
+        
+        正常结束时通知各进程退出并等待；异常路径（如某个进程已崩溃）直接终止仍在运行的进程。
+        发送失败不会掩盖原异常，等待有超时。
+        """
+        if completed:
+            for conn in connections:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass  # 进程已退出
+        for process in processes:
+            if not completed:
+                process.terminate()
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout)
+        for conn in connections:
+            conn.close()
+    
+    def _stop_reason(self, start_time: float, time_limit: float, max_no_improvement: int,
+                     target_cost: float) -> str:
+        """检查终止条件，未满足时返回None"""
+        if not self.generation_history:
+            return None
+        costs = [h['best_cost'] for h in self.generation_history]
+        if target_cost is not None and costs[-1] <= target_cost:
+            return 'target_cost'
+        if time_limit is not None and time.time() - start_time >= time_limit:
+            return 'time_limit'
+        if max_no_improvement is not None and len(costs) - 1 - costs.index(costs[-1]) >= max_no_improvement:
+            return 'no_improvement'
+        return None
+    
+    def _record_generations(self, generations: int):
+        """汇总各岛最近若干代的历史"""
+        for k in range(-generations, 0):
+            entries = [history[k] for history in self.island_histories]
+            self.generation_history.append({
+                'generation': len(self.generation_history),
+                'best_cost': min(e['best_cost'] for e in entries),
+                'avg_cost': float(np.mean([e['avg_cost'] for e in entries])),
+                'worst_cost': max(e['worst_cost'] for e in entries),
+                'island_best_costs': [e['best_cost'] for e in entries]
+            })
+    
+    def _select_best(self) -> EVRPSolution:
+        """在主进程中重新评估各岛最优解并取全局最优"""
+        candidates = decode_migrants(self.problem, self.island_best)
+        for solution in candidates:
+            self.evaluator.evaluate_solution(solution)
+        return min(candidates, key=lambda x: x.total_cost)
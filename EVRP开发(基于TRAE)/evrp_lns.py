@@ -0,0 +1,252 @@
+"""
+EVRP大邻域搜索
+Ruin-and-recreate LNS with simulated-annealing acceptance
+
+每次迭代从当前解破坏一部分客户再重新插入，候选解按模拟退火准则接受：
+- 破坏：random随机删除、radial删除一个随机客户及其最近的客户、
+  string（SISR风格）从随机客户的近邻出发，在各自的路径上删除包含该客户的连续客户串。
+  算子用自适应算子选择（默认ALNS轮盘赌）挑选，删除个数在[min_removal, 上限]内随机。
+- 重建：后悔值插入（k=1为贪心插入），插入成本按资源剖面计算，
+  电量不足的位置计入惩罚；之后对被修改的路径做充电站布置：不可行路径按动态规划
+  重新布置充电站，可行路径删除多余的充电站。
+- 接受：温度由start_temperature × 初始成本按几何方式降到end_temperature × 初始成本，
+  进度取迭代数与已用时间（给定时间上限时）中较大的比例；
+  任一温度为0时退化为下降法，只接受成本不增加的候选解。
+候选解与当前解写时复制共享未修改的路径，评估时只重新计算被修改的路径。
+每segment_length次迭代记为收敛历史的一"代"，算子权重也每段更新一次。
+"""
+
+import math
+import random
+import time
+from typing import List
+
+import numpy as np
+
+from evrp_solver import EVRPProblem, EVRPSolution, EVRPEvaluator, NODE_CUSTOMER
+from evrp_split import SplitDecoder
+from evrp_repair import RegretInsertion
+from evrp_charging import ChargingPlacement
+from evrp_adaptive import OperatorSelector
+
+REMOVAL_OPERATORS = ('random', 'radial', 'string')
+
+
+class EVRPLargeNeighborhoodSearch:
+    """EVRP破坏-重建大邻域搜索求解器
+    
+    接口与EVRPGeneticAlgorithm一致：solve()返回最优解，
+    generation_history为收敛历史（每段迭代一条）。
+    """
+    
+    def __init__(self, problem: EVRPProblem, max_iterations: int = 20000, segment_length: int = 100,
+                 removal_operators: List[str] = REMOVAL_OPERATORS, min_removal: int = 5,
+                 max_removal: int = 40, removal_fraction: float = 0.15, max_string_length: int = 10,
+                 regret_k: int = 3, start_temperature: float = 0.01, end_temperature: float = 0.0001,
+                 operator_selection: str = 'roulette', route_cache_size: int = 10000):
+        for name in removal_operators:
+            if name not in REMOVAL_OPERATORS:
+                raise ValueError(f"未知的破坏算子: {name}")
+        self.problem = problem.compile()
+        self.max_iterations = max_iterations
+        self.segment_length = segment_length  # 每段迭代数（收敛历史每段一条）
+        self.max_generations = math.ceil(max_iterations / segment_length)
+        self.min_removal = min_removal  # 每次最少删除的客户数
+        self.max_removal = max_removal  # 每次最多删除的客户数
+        self.removal_fraction = removal_fraction  # 删除个数上限占客户数的比例
+        self.max_string_length = max_string_length  # string破坏中每个客户串的最大长度
+        self.start_temperature = start_temperature  # 初始温度（相对初始成本）
+        self.end_temperature = end_temperature  # 终止温度（相对初始成本）
+        
+        self.evaluator = EVRPEvaluator(problem, cache_size=route_cache_size, fast_mode=True)
+        self.decoder = SplitDecoder(problem)
+        self.insertion = RegretInsertion(problem, self.evaluator, k=regret_k)
+        self.charger_placer = ChargingPlacement(problem, self.evaluator)
+        self.spatial_index = self.problem.spatial_index()
+        self.operator_selector = OperatorSelector(removal_operators, rule=operator_selection)
+        
+        self.current = None
+        self.best_solution = None
+        self.generation_history = []
+        self.evaluations = 0  # 累计评估的解数量
+        self.stop_reason = None
+    
+    def initial_solution(self, initial_solutions: List = None) -> EVRPSolution:
+        """初始解：热启动解（解或客户排列）中最好的一个，否则取节约法与扫描法中较好的一个"""
+        if initial_solutions:
+            candidates = [s.copy() if isinstance(s, EVRPSolution) else self.decoder.decode(s)
+                          for s in initial_solutions]
+        else:
+            from evrp_construct import InitialConstructor
+            candidates = InitialConstructor(self.problem, self.decoder).generate(2)
+        for solution in candidates:
+            self.evaluate(solution)
+        return min(candidates, key=lambda s: s.total_cost)
+    
+    def evaluate(self, solution: EVRPSolution) -> float:
+        """评估解（未修改的路径沿用上次的成本）"""
+        self.evaluations += 1
+        return self.evaluator.evaluate_solution(solution)
+    
+    def removal_count(self) -> int:
+        """本次迭代删除的客户数"""
+        n = len(self.problem.customers)
+        upper = min(self.max_removal, max(self.min_removal, int(round(self.removal_fraction * n))), n)
+        return random.randint(min(self.min_removal, upper), upper)
+    
+    def random_removal(self, solution: EVRPSolution, count: int) -> set:
+        """随机删除count个客户"""
+        return set(random.sample(self.problem.customer_indices.tolist(), count))
+    
+    def radial_removal(self, solution: EVRPSolution, count: int) -> set:
+        """删除一个随机客户及其最近的count - 1个客户"""
+        seed = random.choice(self.problem.customer_indices.tolist())
+        return {seed} | set(self.spatial_index.nearest_customers(seed, count - 1).tolist())
+    
+    def string_removal(self, solution: EVRPSolution, count: int) -> set:
+        """SISR风格：从随机客户的近邻出发，每条路径删除一个包含该近邻的连续客户串"""
+        route_of = {}
+        for route in solution.routes:
+            customers = [node.index for node in route.sequence if node.node_type == NODE_CUSTOMER]
+            for c in customers:
+                route_of[c] = customers
+            
+        seed = random.choice(self.problem.customer_indices.tolist())
+        candidates = [seed] + self.spatial_index.nearest_customers(seed, len(route_of)).tolist()
+        removed = set()
+        ruined = set()
+        for c in candidates:
+            if len(removed) >= count:
+                break
+            customers = route_of[c]
+            if id(customers) in ruined:
+                continue
+            ruined.add(id(customers))
+            length = random.randint(1, min(self.max_string_length, len(customers), count - len(removed)))
+            # 随机选择包含c的长度为length的客户串
+            position = customers.index(c)
+            start = random.randint(max(0, position - length + 1), min(position, len(customers) - length))
+            removed.update(customers[start:start + length])
+        return removed
+    
+    def ruin(self, solution: EVRPSolution, removed: set):
+        """从解中删除客户，去掉不再含客户的路径"""
+        for r, route in enumerate(solution.routes):
+            if not any(node.index in removed for node in route.sequence):
+                continue
+            route = solution.mutable_route(r)
+            route.sequence = [node for node in route.sequence if node.index not in removed]
+            route.invalidate()
+        solution.routes = [route for route in solution.routes
+                           if any(node.node_type == NODE_CUSTOMER for node in route.sequence)]
+    
+    def recreate(self, solution: EVRPSolution, removed: set):
+        """后悔值插入被删除的客户，再对被修改的路径布置充电站"""
+        nodes = self.problem.nodes
+        customers = [nodes[c] for c in sorted(removed)]
+        random.shuffle(customers)
+        solution.routes = self.insertion.insert(solution.routes, customers, solution._owned)
+        self.charger_placer.improve(solution, remove_redundant=True)
+    
+    def temperature(self, iteration: int, elapsed: float, time_limit: float) -> float:
+        """当前温度：按迭代数与已用时间中较大的进度几何降温（初始或终止温度不为正时为0，即只接受不变差的解）"""
+        if self.t_start <= 0 or self.t_end <= 0:
+            return 0.0
+        progress = iteration / self.max_iterations
+        if time_limit:
+            progress = max(progress, elapsed / time_limit)
+        return self.t_start * (self.t_end / self.t_start) ** min(progress, 1.0)
+    
+    def solve(self, initial_solutions: List = None, time_limit: float = None,
+              max_no_improvement: int = None, target_cost: float = None) -> EVRPSolution:
+        """求解EVRP问题
+        
+        Args:
+            initial_solutions: 热启动解
+            time_limit: 运行时间上限（秒）
+            max_no_improvement: 最优解连续多少段未改进即停止
+            target_cost: 最优成本不高于该值即停止
+        """
+        start_time = time.time()
+        print("开始构造初始解...")
+        self.current = self.initial_solution(initial_solutions)
+        self.best_solution = self.current.copy()
+        initial_cost = max(self.current.total_cost, 1e-9)
+        self.t_start = self.start_temperature * initial_cost
+        self.t_end = self.end_temperature * initial_cost
+        print(f"初始最优成本: {self.best_solution.total_cost:.2f}")
+        
+        removals = {'random': self.random_removal, 'radial': self.radial_removal,
+                    'string': self.string_removal}
+        self.stop_reason = 'max_generations'
+        last_improvement = -1
+        segment_costs = []
+        accepted = 0
+        iteration = 0
+        while iteration < self.max_iterations:
+            elapsed = time.time() - start_time
+            if target_cost is not None and self.best_solution.total_cost <= target_cost:
+                self.stop_reason = 'target_cost'
+                break
+            if time_limit is not None and elapsed >= time_limit:
+                self.stop_reason = 'time_limit'
+                break
+            segment = len(self.generation_history)
+            if max_no_improvement is not None and segment - 1 - last_improvement >= max_no_improvement:
+                self.stop_reason = 'no_improvement'
+                break
+                
+            # 破坏与重建
+            operator_start = time.process_time()
+            name = self.operator_selector.select()
+            self.operator_selector.count(name)
+            candidate = self.current.share()
+            removed = removals[name](candidate, self.removal_count())
+            self.ruin(candidate, removed)
+            self.recreate(candidate, removed)
+            self.operator_selector.add_time(name, time.process_time() - operator_start)
+            self.evaluate(candidate)
+            
+            # 模拟退火接受
+            delta = candidate.total_cost - self.current.total_cost
+            temperature = self.temperature(iteration, elapsed, time_limit)
+            if temperature > 0:
+                is_accepted = delta < 0 or random.random() < math.exp(-delta / temperature)
+            else:
+                is_accepted = delta <= 0
+            new_best = candidate.total_cost < self.best_solution.total_cost - 1e-9
+            self.operator_selector.record(name, delta, new_best, accepted=is_accepted)
+            if is_accepted:
+                self.current = candidate
+                accepted += 1
+            if new_best:
+                self.best_solution = candidate.copy()
+                last_improvement = segment
+            segment_costs.append(self.current.total_cost)
+            
+            iteration += 1
+            if iteration % self.segment_length == 0 or iteration == self.max_iterations:
+                self.record_generation(segment_costs, accepted, temperature)
+                segment_costs = []
+                accepted = 0
+                if segment % 50 == 0:
+                    print(f"第{segment}段: 最优成本 = {self.best_solution.total_cost:.2f}")
+            
+        if segment_costs:
+            self.record_generation(segment_costs, accepted, temperature)
+        print(f"最终最优成本: {self.best_solution.total_cost:.2f}")
+        return self.best_solution
+    
+    def record_generation(self, segment_costs: List[float], accepted: int, temperature: float):
+        """记录一段迭代的收敛历史：当前解成本的平均/最大值、接受率、温度和破坏算子统计"""
+        self.generation_history.append({
+            'generation': len(self.generation_history),
+            'best_cost': self.best_solution.total_cost,
+            'avg_cost': float(np.mean(segment_costs)),
+            'worst_cost': max(segment_costs),
+            'acceptance_rate': accepted / len(segment_costs),
+            'temperature': temperature
+        })
+        for name, stats in self.operator_selector.end_generation().items():
+            for stat, value in stats.items():
+                self.generation_history[-1][f'op_{name}_{stat}'] = value
@@ -0,0 +1,256 @@
+"""
+EVRP局部搜索（模因算法的教育步骤）
+Granular local search: 2-opt, 2-opt*, or-opt, relocate, swap, cross-exchange
+
+每个客户只与其k个最近邻客户组合生成邻域动作（粒度邻域）。
+新路径统一表示为"路径X的前缀 + 少量显式节点 + 路径Y的后缀"，
+借助EVRPEvaluator的资源剖面：前缀状态O(1)取得，中间节点逐个延伸，
+后缀可行性O(1)判断。因此路径间的动作为常数时间；路径内的2-opt和
+移动需要重走被改变的中间段，代价与该段长度成正比。
+只接受使所有相关路径可行且总成本（含违反约束惩罚）下降的动作。
+"""
+
+import random
+from typing import List, Dict
+
+from evrp_solver import (EVRPProblem, EVRPSolution, EVRPEvaluator, Route, NODE_CUSTOMER,
+                         VIOLATION_PENALTY)
+
+MOVE_TYPES = ('relocate', 'swap', 'two_opt', 'two_opt_star', 'or_opt', 'cross_exchange')
+
+
+class LocalSearch:
+    """粒度邻域局部搜索（首次改进）"""
+    
+    def __init__(self, problem: EVRPProblem, evaluator: EVRPEvaluator = None,
+                 num_neighbors: int = 10, max_segment: int = 3):
+        self.problem = problem.compile()
+        self.evaluator = evaluator if evaluator is not None else EVRPEvaluator(problem)
+        self.num_neighbors = num_neighbors
+        self.max_segment = max_segment  # or-opt与交叉交换的最大片段长度
+        self.neighbors = self.build_neighbor_lists(num_neighbors)
+        self.move_counts = {}  # 上次清零以来接受的各类动作数
+        self.reset_counts()
+    
+    def reset_counts(self):
+        """动作计数清零"""
+        self.move_counts = {name: 0 for name in MOVE_TYPES}
+    
+    def build_neighbor_lists(self, k: int) -> Dict[int, List[int]]:
+        """每个客户的k个最近邻客户（候选列表）"""
+        index = self.problem.spatial_index()
+        return {int(i): index.nearest_customers(i, k).tolist()
+                for i in self.problem.customer_indices}
+        
+    # ------------------------------------------------------------------
+    # 可行性与成本
+    # ------------------------------------------------------------------
+    
+    def route_cost(self, route: Route) -> float:
+        """已评估路径的成本（与evaluate_route一致）"""
+        if not route.sequence:
+            return 0.0
+        cost = route.total_distance
+        if route.violation_count > 0:
+            cost += VIOLATION_PENALTY * route.violation_count
+        return cost
+    
+    def concat(self, first: Route, a: int, middle: list, second: Route, b: int) -> float:
+        """新路径 = first.sequence[:a] + middle + second.sequence[b:]
+        
+        返回新路径的距离；不可行时返回None。前缀与后缀都用剖面O(1)处理，
+        中间节点逐个延伸。
+        """
+        evaluator = self.evaluator
+        distance_rows = self.problem.distance_rows
+        if a == 0 and not middle and b == len(second.sequence):
+            return 0.0  # 空路径
+            
+        head = evaluator.route_profile(first)
+        state = evaluator._prefix_state(head, a)
+        if state is None:
+            return None
+        distance = head.distance[a]
+        prev = head.nodes[a]
+        for node in middle:
+            state = evaluator._extend(state, node)
+            if state is None:
+                return None
+            distance += distance_rows[prev][node.index]
+            prev = node.index
+            
+        tail = evaluator.route_profile(second)
+        k = b + 1
+        if not evaluator._suffix_feasible(tail, k, state):
+            return None
+        return distance + distance_rows[prev][tail.nodes[k]] + tail.distance[-1] - tail.distance[k]
+        
+    # ------------------------------------------------------------------
+    # 主循环
+    # ------------------------------------------------------------------
+    
+    def improve(self, solution: EVRPSolution, max_moves: int = 1000) -> int:
+        """对解做局部搜索直到局部最优，返回接受的动作数；结果写回solution并重新评估"""
+        for route in solution.routes:
+            if route.sequence and route.dirty:
+                self.evaluator.evaluate_route(route)
+            
+        self.solution = solution
+        self.rebuild_positions()
+        accepted = 0
+        improved = True
+        while improved and accepted < max_moves:
+            improved = False
+            customers = list(self.positions)
+            random.shuffle(customers)
+            for u in customers:
+                for v in self.neighbors[u]:
+                    if self.try_moves(u, v):
+                        accepted += 1
+                        improved = True
+                        break
+            
+        self.evaluator.evaluate_solution(solution)
+        self.solution = None
+        return accepted
+    
+    def rebuild_positions(self):
+        """客户索引 -> (路径号, 序列位置)"""
+        self.positions = {}
+        for r, route in enumerate(self.solution.routes):
+            for p, node in enumerate(route.sequence):
+                if node.node_type == NODE_CUSTOMER:
+                    self.positions[node.index] = (r, p)
+    
+    def apply(self, move_type: str, changes: List):
+        """应用动作：changes为[(路径号, 新序列)]"""
+        solution = self.solution
+        for r, sequence in changes:
+            route = solution.mutable_route(r)
+            route.sequence = sequence
+            route.invalidate()
+            if sequence:
+                self.evaluator.evaluate_route(route)
+        if any(not sequence for _, sequence in changes):
+            solution.routes = [route for route in solution.routes if route.sequence]
+            self.rebuild_positions()
+        else:
+            for r, sequence in changes:
+                for p, node in enumerate(sequence):
+                    if node.node_type == NODE_CUSTOMER:
+                        self.positions[node.index] = (r, p)
+        self.move_counts[move_type] += 1
+    
+    def try_moves(self, u: int, v: int) -> bool:
+        """尝试所有在u与v之间建立相邻关系的动作，接受第一个改进"""
+        ru, i = self.positions[u]
+        rv, j = self.positions[v]
+        if ru == rv:
+            return self.intra_route_moves(ru, i, j)
+        return self.inter_route_moves(ru, i, rv, j)
+    
+    def accept(self, move_type: str, old_cost: float, candidates: List) -> bool:
+        """candidates为[(路径号, 新距离, 新序列构造函数)]，全部可行且改进时应用"""
+        new_cost = 0.0
+        for _, distance, _ in candidates:
+            if distance is None:
+                return False
+            new_cost += distance
+        if new_cost >= old_cost - 1e-9:
+            return False
+        self.apply(move_type, [(r, build()) for r, _, build in candidates])
+        return True
+    
+    def inter_route_moves(self, ru: int, i: int, rv: int, j: int) -> bool:
+        """不同路径间的动作（均为常数时间检查）"""
+        A = self.solution.routes[ru]
+        B = self.solution.routes[rv]
+        a, b = A.sequence, B.sequence
+        old = self.route_cost(A) + self.route_cost(B)
+        u, v = a[i], b[j]
+        concat = self.concat
+        
+        # relocate：u移到v之后 / 之前
+        for p in (j + 1, j):
+            if self.accept('relocate', old, [
+                    (ru, concat(A, i, [], A, i + 1), lambda: a[:i] + a[i + 1:]),
+                    (rv, concat(B, p, [u], B, p), lambda p=p: b[:p] + [u] + b[p:])]):
+                return True
+            
+        # swap
+        if self.accept('swap', old, [
+                (ru, concat(A, i, [v], A, i + 1), lambda: a[:i] + [v] + a[i + 1:]),
+                (rv, concat(B, j, [u], B, j + 1), lambda: b[:j] + [u] + b[j + 1:])]):
+            return True
+            
+        # 2-opt*：交换尾部，形成弧(u, v)
+        if self.accept('two_opt_star', old, [
+                (ru, concat(A, i + 1, [], B, j), lambda: a[:i + 1] + b[j:]),
+                (rv, concat(B, j, [], A, i + 1), lambda: b[:j] + a[i + 1:])]):
+            return True
+            
+        # or-opt：以u开头的片段移到v之后
+        for length in range(2, self.max_segment + 1):
+            if i + length > len(a):
+                break
+            segment = a[i:i + length]
+            if self.accept('or_opt', old, [
+                    (ru, concat(A, i, [], A, i + length), lambda l=length: a[:i] + a[i + l:]),
+                    (rv, concat(B, j + 1, segment, B, j + 1),
+                     lambda s=segment: b[:j + 1] + s + b[j + 1:])]):
+                return True
+            
+        # cross-exchange：交换以u、v开头的片段（1×1即swap，已在上面处理）
+        for la in range(1, self.max_segment + 1):
+            if i + la > len(a):
+                break
+            for lb in range(1, self.max_segment + 1):
+                if j + lb > len(b):
+                    break
+                if la == 1 and lb == 1:
+                    continue
+                seg_a, seg_b = a[i:i + la], b[j:j + lb]
+                if self.accept('cross_exchange', old, [
+                        (ru, concat(A, i, seg_b, A, i + la),
+                         lambda la=la, s=seg_b: a[:i] + s + a[i + la:]),
+                        (rv, concat(B, j, seg_a, B, j + lb),
+                         lambda lb=lb, s=seg_a: b[:j] + s + b[j + lb:])]):
+                    return True
+        return False
+    
+    def intra_route_moves(self, r: int, i: int, j: int) -> bool:
+        """同一路径内的动作：2-opt、relocate、or-opt、swap（需重走中间段）"""
+        A = self.solution.routes[r]
+        a = A.sequence
+        old = self.route_cost(A)
+        concat = self.concat
+        
+        # 2-opt：反转u之后到v的片段，形成弧(u, v)
+        if i < j:
+            middle = a[i + 1:j + 1][::-1]
+            if self.accept('two_opt', old, [
+                    (r, concat(A, i + 1, middle, A, j + 1),
+                     lambda: a[:i + 1] + middle + a[j + 1:])]):
+                return True
+            
+        # relocate / or-opt：以u开头的片段移到v之后
+        for length in range(1, self.max_segment + 1):
+            if i + length > len(a) or i <= j < i + length:
+                break
+            segment = a[i:i + length]
+            if j > i:
+                middle = a[i + length:j + 1] + segment
+                candidate = (r, concat(A, i, middle, A, j + 1),
+                             lambda m=middle: a[:i] + m + a[j + 1:])
+            else:
+                middle = segment + a[j + 1:i]
+                candidate = (r, concat(A, j + 1, middle, A, i + length),
+                             lambda m=middle, l=length: a[:j + 1] + m + a[i + l:])
+            if self.accept('relocate' if length == 1 else 'or_opt', old, [candidate]):
+                return True
+            
+        # swap
+        lo, hi = min(i, j), max(i, j)
+        middle = [a[hi]] + a[lo + 1:hi] + [a[lo]]
+        return self.accept('swap', old, [
+            (r, concat(A, lo, middle, A, hi + 1), lambda: a[:lo] + middle + a[hi + 1:])])
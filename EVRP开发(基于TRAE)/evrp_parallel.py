@@ -0,0 +1,150 @@
+"""
+EVRP并行评估
+Process-pool parallel fitness evaluation
+
+问题的坐标、距离矩阵和节点属性数组放入multiprocessing.shared_memory，
+工作进程启动时只挂载一次，任务中只传递扁平的节点索引数组。
+各路径的计算互相独立且与EVRPBatchEvaluator完全相同，结果与串行逐位一致。
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import List
+
+import numpy as np
+
+from evrp_solver import EVRPProblem, EVRPBatchEvaluator, RouteCache, Depot
+
+
+# 共享给工作进程的问题数组（EVRPBatchEvaluator.evaluate_routes所需）
+SHARED_ARRAYS = ('coordinates', 'distance_matrix', 'node_types', 'demands', 'service_times',
+                 'tw_early', 'tw_late', 'charging_rates')
+
+METRIC_NAMES = ('distance', 'load', 'time', 'battery_consumption',
+                'violations', 'violation_mask', 'cost')
+
+# 工作进程内的全局状态
+_worker_evaluator = None
+_worker_blocks = []
+
+
+class SharedProblemData:
+    """把编译后问题的数组复制到共享内存，生成工作进程可挂载的描述"""
+    
+    def __init__(self, problem: EVRPProblem):
+        problem = problem.compile()
+        self.blocks = []
+        arrays = []
+        for name in SHARED_ARRAYS:
+            array = np.ascontiguousarray(getattr(problem, name))
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            arrays.append((name, block.name, array.shape, array.dtype.str))
+            
+        self.spec = {
+            'arrays': arrays,
+            'vehicle_capacity': problem.vehicle_capacity,
+            'vehicle_battery': problem.vehicle_battery,
+            'consumption_rate': problem.consumption_rate,
+            'loading_time': problem.loading_time,
+            'speed': problem.speed,
+        }
+    
+    def close(self):
+        """释放并删除共享内存"""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach_problem(spec: dict) -> EVRPProblem:
+    """按描述挂载共享内存，重建只含数组的已编译问题"""
+    problem = EVRPProblem()
+    problem.set_vehicle_constraints(spec['vehicle_capacity'], spec['vehicle_battery'],
+                                    spec['consumption_rate'], spec['loading_time'])
+    problem.speed = spec['speed']
+    
+    for name, block_name, shape, dtype in spec['arrays']:
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)  # 保持引用，避免缓冲区被回收
+        setattr(problem, name, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+        
+    x, y = problem.coordinates[0]
+    problem.depot = Depot(0, float(x), float(y), index=0)
+    problem.compiled = True
+    return problem
+
+
+def _init_worker(spec: dict):
+    """工作进程初始化：挂载问题数据并创建批量评估器"""
+    global _worker_evaluator
+    _worker_evaluator = EVRPBatchEvaluator(attach_problem(spec))
+
+
+def _evaluate_chunk(task):
+    """评估一块路径；task为(扁平节点索引, 各路径长度)"""
+    tour, lengths = task
+    width = int(lengths.max()) + 1
+    index_matrix = np.full((len(lengths), width), 0, dtype=np.int32)
+    index_matrix[np.arange(width) < lengths[:, None]] = tour
+    results = _worker_evaluator.evaluate_routes(index_matrix)
+    return tuple(results[name] for name in METRIC_NAMES)
+
+
+class ParallelBatchEvaluator(EVRPBatchEvaluator):
+    """多进程批量评估器
+    
+    缓存查询仍在主进程完成，只有未命中的路径按工作进程数分块发送。
+    进程池在首次评估时创建，用完后需调用close()。
+    """
+    
+    def __init__(self, problem: EVRPProblem, cache: RouteCache = None, num_workers: int = 2):
+        super().__init__(problem, cache)
+        self.num_workers = num_workers
+        self.shared = None
+        self.pool = None
+    
+    def start(self):
+        """创建共享内存和进程池"""
+        if self.pool is None:
+            self.shared = SharedProblemData(self.problem)
+            self.pool = mp.Pool(self.num_workers, initializer=_init_worker,
+                                initargs=(self.shared.spec,))
+        return self
+    
+    def close(self):
+        """关闭进程池并释放共享内存"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def compute_metrics(self, sequences: List[List[int]]):
+        """按块分发给工作进程计算，再按原顺序拼接"""
+        if len(sequences) < 2 * self.num_workers:
+            return super().compute_metrics(sequences)
+            
+        self.start()
+        tasks = []
+        for chunk in np.array_split(np.arange(len(sequences)), self.num_workers):
+            chunk_sequences = [sequences[i] for i in chunk]
+            lengths = np.array([len(seq) for seq in chunk_sequences], dtype=np.int64)
+            tour = np.fromiter((j for seq in chunk_sequences for j in seq),
+                               dtype=np.int32, count=int(lengths.sum()))
+            tasks.append((tour, lengths))
+            
+        parts = self.pool.map(_evaluate_chunk, tasks)
+        columns = [np.concatenate([part[k] for part in parts]).tolist()
+                   for k in range(len(METRIC_NAMES))]
+        return zip(*columns)
@@ -0,0 +1,204 @@
+"""
+EVRP后悔值插入修复
+Regret-k insertion with a cached (customer, route) insertion-cost matrix
+
+维护每个待插入客户在每条路径上的最优插入成本与位置（增量成本与
+EVRPEvaluator.evaluate_insertion一致：距离增量，不可行时加一次惩罚）。
+每步选择后悔值最大的客户——其在最优的k条路径上的成本与最优成本之差的和
+（k=1退化为贪心插入成本最小的客户）——插入其最优位置，
+之后只重新计算被修改路径那一列。
+成本借助路径的资源剖面计算：各路径的所有插入位置拼接后，对所有待插入客户
+用NumPy一次完成（前缀状态、延伸到客户、后缀O(1)可行性判断均向量化）。
+另设一列"新开一条只含该客户的路径"，避免只能以惩罚代价插入已有路径。
+"""
+
+from typing import List, Set
+
+import numpy as np
+
+from evrp_solver import EVRPProblem, EVRPEvaluator, Route, VIOLATION_PENALTY
+
+
+class RegretInsertion:
+    """后悔值插入引擎"""
+    
+    def __init__(self, problem: EVRPProblem, evaluator: EVRPEvaluator = None, k: int = 3):
+        self.problem = problem.compile()
+        self.evaluator = evaluator if evaluator is not None else EVRPEvaluator(problem)
+        self.k = k  # 后悔值考虑的路径数
+        self.charging_rates = self.problem.charging_rates
+    
+    def position_arrays(self, routes: List[Route]):
+        """各路径所有插入位置上计算增量所需的剖面量，拼接为一维数组
+        
+        插入位置p在剖面节点p与p+1之间（插入到route.sequence[p]之前），
+        后缀从剖面位置k=p+1开始，c为其后的下一个充电点（或终点）。
+        各路径剖面的列表先首尾相接，再统一转换为数组，避免逐条路径调用NumPy。
+        
+        Returns:
+            (各量数组的字典, 每条路径第一个插入位置的偏移)
+        """
+        fields = ('nodes', 'load', 'battery', 'battery_out', 'arrival', 'departure', 'violations', 'charge_pos')
+        suffix_fields = ('late_segment', 'early_segment', 'late_suffix', 'early_suffix',
+                         'battery_violations_suffix')
+        merged = {name: [] for name in fields + suffix_fields}
+        lengths = []
+        for route in routes:
+            profile = self.evaluator.route_profile(route)
+            lengths.append(len(profile.nodes))
+            for name in fields + suffix_fields:
+                merged[name].extend(getattr(profile, name))
+        merged = {name: np.array(values) for name, values in merged.items()}
+        
+        lengths = np.array(lengths)
+        offsets = np.cumsum(lengths) - lengths           # 各路径剖面在拼接数组中的起点
+        suffix_offsets = offsets + np.arange(len(lengths))  # 后缀数组每条路径多一个元素
+        starts = offsets - np.arange(len(lengths))       # 各路径第一个插入位置的编号
+        route_of = np.repeat(np.arange(len(lengths)), lengths - 1)
+        local = np.arange(len(route_of)) - starts[route_of]  # 路径内的插入位置p
+        n = lengths[route_of]
+        p = offsets[route_of] + local
+        c = merged['charge_pos'][p + 1]                  # 路径内的充电点位置
+        last = np.where(c < n - 1, c, c - 1)
+        base = offsets[route_of]
+        suffix = suffix_offsets[route_of] + c + 1
+        nodes = merged['nodes']
+        arrays = {
+            'a': nodes[p], 'b': nodes[p + 1], 'ok': merged['violations'][p] == 0,
+            'load': merged['load'][p], 'total_load': merged['load'][base + n - 1],
+            'battery_out': merged['battery_out'][p], 'departure': merged['departure'][p],
+            'battery_k': merged['battery'][p + 1], 'arrival_k': merged['arrival'][p + 1],
+            'late_segment': merged['late_segment'][suffix_offsets[route_of] + local + 1],
+            'early_segment': merged['early_segment'][suffix_offsets[route_of] + local + 1],
+            'checked': last >= local + 1, 'battery_last': merged['battery'][base + last],
+            'charged': c < n - 1, 'rate': self.charging_rates[nodes[base + c]],
+            'battery_c': merged['battery'][base + c], 'arrival_c': merged['arrival'][base + c],
+            'departure_c': merged['departure'][base + c],
+            'late_suffix': merged['late_suffix'][suffix], 'early_suffix': merged['early_suffix'][suffix],
+            'violation_free': merged['battery_violations_suffix'][suffix] == 0,
+        }
+        return arrays, starts
+    
+    def insertion_costs(self, routes: List[Route], customers: np.ndarray):
+        """customers（稠密索引数组）插入各路径的最优增量成本与位置
+        
+        所有路径的所有位置一次向量化计算，规则与evaluate_insertion一致。
+        
+        Returns:
+            (增量成本矩阵[m, R], 插入位置矩阵[m, R])，位置为插入到route.sequence[位置]之前
+        """
+        problem = self.problem
+        if not routes:
+            return np.empty((len(customers), 0)), np.zeros((len(customers), 0), dtype=int)
+        p, starts = self.position_arrays(routes)
+        a, b = p['a'][None, :], p['b'][None, :]
+        c = customers[:, None]
+        capacity = problem.vehicle_capacity
+        
+        delta = (problem.distance_matrix[a, c] + problem.distance_matrix[c, b] -
+                 problem.distance_matrix[p['a'], p['b']][None, :])
+            
+        # 前缀无违反、延伸到客户可行
+        energy_in = problem.energy_matrix[a, c]
+        arrival = p['departure'][None, :] + problem.time_matrix[a, c]
+        battery = p['battery_out'][None, :] - energy_in
+        new_load = p['load'][None, :] + problem.demands[c]
+        feasible = (p['ok'][None, :] & (p['battery_out'][None, :] >= energy_in) & (new_load <= capacity) &
+                    (problem.tw_early[c] <= arrival) & (arrival <= problem.tw_late[c]))
+        departure = arrival + problem.service_times[c]
+        
+        # 后缀：载重、充电点之前的电量与时间窗平移
+        feasible &= new_load + p['total_load'][None, :] - p['load'][None, :] <= capacity
+        delta_battery = battery - problem.energy_matrix[c, b] - p['battery_k'][None, :]
+        feasible &= ~p['checked'][None, :] | (p['battery_last'][None, :] + delta_battery >= 0)
+        delta_time = departure + problem.time_matrix[c, b] - p['arrival_k'][None, :]
+        feasible &= ((delta_time <= p['late_segment'][None, :]) &
+                     (-delta_time <= p['early_segment'][None, :]))
+            
+        # 后缀：充电点之后电量充满，统一时间平移
+        if p['charged'].any():
+            charge_time = (problem.vehicle_battery - p['battery_c'][None, :] - delta_battery) / p['rate'][None, :]
+            shift = p['arrival_c'][None, :] + delta_time + charge_time - p['departure_c'][None, :]
+            suffix_ok = ((shift <= p['late_suffix'][None, :]) & (-shift <= p['early_suffix'][None, :]) &
+                         p['violation_free'][None, :])
+            feasible &= ~p['charged'][None, :] | suffix_ok
+            
+        # 每条路径内取第一个最小值的位置
+        cost = delta + VIOLATION_PENALTY * ~feasible
+        best = np.minimum.reduceat(cost, starts, axis=1)
+        route_of = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, cost.shape[1])))
+        index = np.where(cost == best[:, route_of], np.arange(cost.shape[1])[None, :], cost.shape[1])
+        positions = np.minimum.reduceat(index, starts, axis=1) - starts[None, :]
+        return best, positions
+    
+    def new_route_costs(self, customers: np.ndarray) -> np.ndarray:
+        """为每个客户单独新开一条路径的成本（与evaluate_insertion规则一致）"""
+        problem = self.problem
+        depot = problem.depot.index
+        arrival = problem.time_matrix[depot, customers]
+        feasible = ((problem.energy_matrix[depot, customers] <= problem.vehicle_battery) &
+                    (problem.demands[customers] <= problem.vehicle_capacity) &
+                    (problem.tw_early[customers] <= arrival) & (arrival <= problem.tw_late[customers]))
+        cost = problem.distance_matrix[depot, customers] + problem.distance_matrix[customers, depot]
+        return cost + VIOLATION_PENALTY * ~feasible
+    
+    def insert(self, routes: List[Route], customers: List, owned: Set[Route] = None) -> List[Route]:
+        """把customers（客户节点）逐个插入routes，返回新的路径列表
+        
+        Args:
+            routes: 当前路径（不修改列表本身）
+            customers: 待插入的客户节点
+            owned: 可以直接修改的路径集合，其余路径修改前先复制；新路径和复制的路径会加入该集合
+        """
+        routes = list(routes)
+        if owned is None:
+            owned = set(routes)
+        if not customers:
+            return routes
+            
+        problem = self.problem
+        pending = np.array([c.index for c in customers])
+        costs, positions = self.insertion_costs(routes, pending)
+        # 最后一列为新开路径
+        costs = np.column_stack([costs, self.new_route_costs(pending)])
+        positions = np.column_stack([positions, np.zeros(len(pending), dtype=int)])
+        
+        while len(pending):
+            row = self.select(costs)
+            r = int(costs[row].argmin())
+            customer = problem.nodes[pending[row]]
+            if r == len(routes):
+                route = Route(self.problem)
+                route.sequence.append(customer)
+                routes.append(route)
+                owned.add(route)
+            else:
+                route = routes[r]
+                if route not in owned:
+                    route = route.copy()
+                    routes[r] = route
+                    owned.add(route)
+                route.sequence.insert(int(positions[row, r]), customer)
+            route.invalidate()
+            
+            pending = np.delete(pending, row)
+            costs = np.delete(costs, row, axis=0)
+            positions = np.delete(positions, row, axis=0)
+            if not len(pending):
+                break
+            if r == costs.shape[1] - 1:
+                # 新路径成为普通的一列，新开路径列仍放在最后
+                costs = np.insert(costs, r, 0.0, axis=1)
+                positions = np.insert(positions, r, 0, axis=1)
+            column, column_positions = self.insertion_costs([route], pending)
+            costs[:, r], positions[:, r] = column[:, 0], column_positions[:, 0]
+            
+        return routes
+    
+    def select(self, costs: np.ndarray) -> int:
+        """后悔值最大的客户所在行；后悔值相同时选最优成本小的"""
+        if self.k <= 1 or costs.shape[1] < 2:
+            return int(costs.min(axis=1).argmin())
+        ordered = np.sort(costs, axis=1)[:, :self.k]
+        regret = (ordered[:, 1:] - ordered[:, :1]).sum(axis=1)
+        return int(np.lexsort((ordered[:, 0], -regret))[0])
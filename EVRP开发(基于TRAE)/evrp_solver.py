@@ -9,14 +9,30 @@ Electric Vehicle Routing Problem with Charging Stations - Genetic Algorithm Solv
 import numpy as np
 import matplotlib.pyplot as plt
 import random
-from typing import List, Tuple, Dict
+import bisect
+from typing import List, Tuple, Dict, NamedTuple, ClassVar
 import json
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from copy import deepcopy
+from collections import OrderedDict
 
 
-@dataclass
+# 节点类型编码（与编译后的索引数组配合使用）
+NODE_DEPOT = 0
+NODE_CUSTOMER = 1
+NODE_STATION = 2
+
+# 每处约束违反的惩罚成本
+VIOLATION_PENALTY = 1000
+
+# 约束违反类型位掩码
+VIOLATION_BATTERY = 1
+VIOLATION_CAPACITY = 2
+VIOLATION_TIME_WINDOW = 4
+
+
+@dataclass(frozen=True, slots=True)
 class Customer:
     """客户节点类"""
     id: int
@@ -25,9 +41,11 @@ class Customer:
     demand: float
     service_time: float = 0.0
     time_window: Tuple[float, float] = (0, 1000)
+    index: int = field(default=-1, compare=False)  # 编译后的稠密索引
+    node_type: ClassVar[int] = NODE_CUSTOMER
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChargingStation:
     """充电站节点类"""
     id: int
@@ -35,9 +53,11 @@ class ChargingStation:
     y: float
     charging_rate: float = 1.0  # 充电速率 (单位时间充电量)
     waiting_cost: float = 0.1  # 等待时间成本
+    index: int = field(default=-1, compare=False)  # 编译后的稠密索引
+    node_type: ClassVar[int] = NODE_STATION
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Depot:
     """配送中心类"""
     id: int
@@ -45,6 +65,8 @@ class Depot:
     y: float
     ready_time: float = 0.0
     due_time: float = 1000.0
+    index: int = field(default=-1, compare=False)  # 编译后的稠密索引
+    node_type: ClassVar[int] = NODE_DEPOT
 
 
 class EVRPProblem:
@@ -59,18 +81,29 @@ class EVRPProblem:
         self.consumption_rate = 0  # 单位距离耗电量
         self.loading_time = 0
         self.speed = 1.0
+        self.compiled = False  # 是否已生成索引和距离矩阵
+        self._spatial_index = None
+        self._detour_table = None
         
-    def add_depot(self, depot: Depot):
-        """添加配送中心"""
-        self.depot = depot
+    def add_depot(self, depot: Depot) -> Depot:
+        """添加配送中心，返回带稠密索引的节点（构建路径时应使用返回的节点）"""
+        self.depot = replace(depot, index=0)
+        self.compiled = False
+        return self.depot
         
-    def add_customer(self, customer: Customer):
-        """添加客户"""
+    def add_customer(self, customer: Customer) -> Customer:
+        """添加客户，返回带稠密索引的节点（已添加的充电站索引随之后移）"""
+        customer = replace(customer, index=len(self.customers) + 1)
         self.customers.append(customer)
+        self.compiled = False
+        return customer
         
-    def add_charging_station(self, station: ChargingStation):
-        """添加充电站"""
+    def add_charging_station(self, station: ChargingStation) -> ChargingStation:
+        """添加充电站，返回带稠密索引的节点"""
+        station = replace(station, index=len(self.customers) + len(self.charging_stations) + 1)
         self.charging_stations.append(station)
+        self.compiled = False
+        return station
         
     def set_vehicle_constraints(self, capacity: float, battery: float, 
                                consumption_rate: float, loading_time: float = 0):
@@ -79,11 +112,89 @@ class EVRPProblem:
         self.vehicle_battery = battery
         self.consumption_rate = consumption_rate
         self.loading_time = loading_time
+        self.compiled = False
+        
+    def compile(self, force: bool = False) -> 'EVRPProblem':
+        """编译问题：分配稠密索引并预计算距离/能耗/时间矩阵
+        
+        索引约定：配送中心为0，随后依次为客户和充电站。节点对象不可变，
+        add_*已按此约定分配索引；先加充电站后加客户时充电站索引会后移，
+        此时用带新索引的副本替换问题中的节点，旧节点对象在评估时被拒绝。
+        问题数据修改后会自动标记为未编译，下次调用时重新生成。
+        """
+        if self.compiled and not force:
+            return self
+            
+        nodes = [node if node.index == i else replace(node, index=i)
+                 for i, node in enumerate(self.get_all_nodes())]
+        num_customers = len(self.customers)
+        self.depot = nodes[0]
+        self.customers = nodes[1:num_customers + 1]
+        self.charging_stations = nodes[num_customers + 1:]
+        self.nodes = nodes
+        
+        self.customer_indices = np.arange(1, num_customers + 1)
+        self.station_indices = np.arange(num_customers + 1, len(nodes))
+        
+        # 节点属性数组
+        self.node_types = np.array([n.node_type for n in nodes], dtype=np.int8)
+        self.demands = np.array([getattr(n, 'demand', 0.0) for n in nodes], dtype=float)
+        self.service_times = np.array([getattr(n, 'service_time', 0.0) for n in nodes], dtype=float)
+        self.tw_early = np.array([n.time_window[0] if hasattr(n, 'time_window') else -np.inf
+                                  for n in nodes], dtype=float)
+        self.tw_late = np.array([n.time_window[1] if hasattr(n, 'time_window') else np.inf
+                                 for n in nodes], dtype=float)
+        self.charging_rates = np.array([getattr(n, 'charging_rate', 1.0) for n in nodes], dtype=float)
+        
+        # 距离、能耗、行驶时间矩阵
+        self.coordinates = np.array([[n.x, n.y] for n in nodes], dtype=float)
+        dx = self.coordinates[:, 0][:, None] - self.coordinates[:, 0][None, :]
+        dy = self.coordinates[:, 1][:, None] - self.coordinates[:, 1][None, :]
+        self.distance_matrix = np.sqrt(dx**2 + dy**2)
+        self.energy_matrix = self.distance_matrix * self.consumption_rate
+        self.time_matrix = self.distance_matrix / self.speed
+        
+        # 逐元素访问时Python列表比ndarray标量索引快得多；只保留距离的列表副本，
+        # 能耗和行驶时间在标量代码中按距离 * consumption_rate、距离 / speed计算
+        self.distance_rows = self.distance_matrix.tolist()
+        
+        self._spatial_index = None
+        self._detour_table = None
+        self.compiled = True
+        return self
+        
+    def spatial_index(self):
+        """按距离排序的近邻表索引：每个节点到各充电站的有序表和最近的k个客户（编译后首次使用时构建）"""
+        self.compile()
+        if self._spatial_index is None:
+            from evrp_spatial import SpatialIndex
+            self._spatial_index = SpatialIndex(self)
+        return self._spatial_index
+        
+    def detour_table(self):
+        """节点对之间的最优充电绕行表（编译后首次使用时构建）"""
+        self.compile()
+        if self._detour_table is None:
+            from evrp_detour import DetourTable
+            self._detour_table = DetourTable(self)
+        return self._detour_table
         
     def calculate_distance(self, node1, node2) -> float:
         """计算两点间欧氏距离"""
+        if self.compiled and node1.index >= 0 and node2.index >= 0:
+            return self.distance_rows[node1.index][node2.index]
         return np.sqrt((node1.x - node2.x)**2 + (node1.y - node2.y)**2)
     
+    def check_nodes(self, sequence):
+        """检查节点序列都是本问题中的节点，索引过期或未分配（-1）时抛出ValueError"""
+        nodes = self.nodes
+        n = len(nodes)
+        for node in sequence:
+            j = node.index
+            if not 0 <= j < n or (nodes[j] is not node and nodes[j] != node):
+                raise ValueError(f"节点{node.id}的索引{j}与问题不一致，"
+                                 f"请使用add_*返回的节点或problem.nodes中的节点")
+                
     def get_all_nodes(self):
         """获取所有节点"""
         nodes = [self.depot]
@@ -92,9 +203,57 @@ class EVRPProblem:
         return nodes
 
 
+class RouteProfile:
+    """路径资源剖面（用于O(1)增量评估）
+    
+    位置0为出发的配送中心，1..L为路径序列，L+1为返回的配送中心。
+    前缀数组记录到达各位置时的累计载重、电量、时间和距离；
+    后缀数组记录到下一个充电点（充电站或终点）之前以及之后的
+    时间窗松弛量，用于判断整体时间平移后是否仍然满足时间窗。
+    """
+    
+    __slots__ = ('nodes', 'load', 'distance', 'arrival', 'departure', 'battery',
+                 'battery_out', 'violations', 'charge_pos', 'late_segment',
+                 'early_segment', 'late_suffix', 'early_suffix', 'battery_violations_suffix')
+    
+    def __init__(self, num_positions: int, battery: float):
+        inf = float('inf')
+        self.nodes = [0] * num_positions
+        self.load = [0.0] * num_positions          # 离开该位置时的累计载重
+        self.distance = [0.0] * num_positions      # 到达该位置时的累计距离
+        self.arrival = [0.0] * num_positions       # 到达时间（服务/充电前）
+        self.departure = [0.0] * num_positions     # 离开时间（服务/充电后）
+        self.battery = [battery] * num_positions   # 到达时剩余电量（充电前）
+        self.battery_out = [battery] * num_positions  # 离开时电量
+        self.violations = [0] * num_positions      # 前缀违反约束次数
+        self.charge_pos = [num_positions - 1] * num_positions  # 下一个充电点位置
+        self.late_segment = [inf] * (num_positions + 1)   # 到充电点前 min(最晚时间-到达时间)
+        self.early_segment = [inf] * (num_positions + 1)  # 到充电点前 min(到达时间-最早时间)
+        self.late_suffix = [inf] * (num_positions + 1)    # 到终点 min(最晚时间-到达时间)
+        self.early_suffix = [inf] * (num_positions + 1)   # 到终点 min(到达时间-最早时间)
+        self.battery_violations_suffix = [0] * (num_positions + 1)
+
+
+class MoveEvaluation(NamedTuple):
+    """邻域移动的增量评估结果"""
+    delta_distance: float
+    feasible: bool
+    
+    @property
+    def delta_cost(self) -> float:
+        """用于比较的增量成本：不可行的移动附加一次惩罚"""
+        if self.feasible:
+            return self.delta_distance
+        return self.delta_distance + VIOLATION_PENALTY
+
+
 class Route:
     """单条路径类"""
     
+    __slots__ = ('problem', '_sequence', 'total_distance', 'total_load', 'total_time',
+                 'battery_consumption', 'is_feasible', 'violation_count', 'violation_mask',
+                 '_violations', 'profile', 'cost', 'dirty')
+    
     def __init__(self, problem: EVRPProblem):
         self.problem = problem
         self.sequence = []  # 节点访问序列
@@ -103,7 +262,40 @@ class Route:
         self.total_time = 0.0
         self.battery_consumption = 0.0
         self.is_feasible = True
-        self.violations = []
+        self.violation_count = 0
+        self.violation_mask = 0  # VIOLATION_* 位掩码
+        self._violations = []
+        self.profile = None  # 资源剖面缓存，原地修改sequence后需调用invalidate()
+        self.cost = 0.0  # 评估得到的成本（距离 + 违反约束惩罚）
+        self.dirty = True  # 序列在上次评估后是否被修改过
+        
+    def invalidate(self):
+        """修改sequence后调用：清除剖面缓存，标记为需要重新评估"""
+        self.profile = None
+        self.dirty = True
+        
+    @property
+    def sequence(self) -> list:
+        """节点访问序列"""
+        return self._sequence
+        
+    @sequence.setter
+    def sequence(self, value: list):
+        """整体替换序列时自动清除剖面缓存并标记为需要重新评估"""
+        self._sequence = value
+        self.profile = None
+        self.dirty = True
+        
+    @property
+    def violations(self) -> List[str]:
+        """违反约束的文字描述；快速评估模式下在首次访问时才生成"""
+        if self._violations is None:
+            self._violations = EVRPEvaluator(self.problem).describe_violations(self)
+        return self._violations
+        
+    @violations.setter
+    def violations(self, value: List[str]):
+        self._violations = value
         
     def copy(self):
         """创建路径副本"""
@@ -114,12 +306,24 @@ class Route:
         new_route.total_time = self.total_time
         new_route.battery_consumption = self.battery_consumption
         new_route.is_feasible = self.is_feasible
-        new_route.violations = self.violations.copy()
+        new_route.violation_count = self.violation_count
+        new_route.violation_mask = self.violation_mask
+        new_route._violations = self._violations.copy() if self._violations is not None else None
+        new_route.profile = self.profile  # 剖面只读，序列相同时可共享
+        new_route.cost = self.cost
+        new_route.dirty = self.dirty
         return new_route
 
 
 class EVRPSolution:
-    """EVRP解决方案类"""
+    """EVRP解决方案类
+    
+    支持写时复制：share()得到的副本与原解共享路径对象，修改路径前需通过
+    mutable_route()取得本解独占的路径。_owned为None表示独占全部路径，
+    否则为本解可直接修改的路径集合。
+    """
+    
+    __slots__ = ('problem', 'routes', 'total_cost', 'fitness', 'is_feasible', '_owned')
     
     def __init__(self, problem: EVRPProblem):
         self.problem = problem
@@ -127,100 +331,530 @@ class EVRPSolution:
         self.total_cost = 0.0
         self.fitness = 0.0
         self.is_feasible = True
+        self._owned = None
         
     def copy(self):
-        """创建解决方案副本"""
+        """创建解决方案副本（深复制全部路径）"""
         new_solution = EVRPSolution(self.problem)
         new_solution.routes = [route.copy() for route in self.routes]
         new_solution.total_cost = self.total_cost
         new_solution.fitness = self.fitness
         new_solution.is_feasible = self.is_feasible
         return new_solution
+        
+    def share(self):
+        """创建共享路径的写时复制副本"""
+        new_solution = EVRPSolution(self.problem)
+        new_solution.routes = self.routes.copy()
+        new_solution.total_cost = self.total_cost
+        new_solution.fitness = self.fitness
+        new_solution.is_feasible = self.is_feasible
+        new_solution._owned = set()
+        self._owned = set()  # 原解的路径也已共享，修改前同样需要复制
+        return new_solution
+        
+    def arcs(self) -> set:
+        """解中所有弧(i, j)的集合（含出入配送中心的弧），用于比较个体相似度"""
+        depot = self.problem.depot.index
+        arcs = set()
+        for route in self.routes:
+            prev = depot
+            for node in route.sequence:
+                arcs.add((prev, node.index))
+                prev = node.index
+            arcs.add((prev, depot))
+        return arcs
+        
+    def canonical_key(self) -> tuple:
+        """解的规范表示：各路径节点索引元组排序后的元组，与路径顺序无关
+        
+        路径总是从配送中心出发记录；时间窗和电量与行驶方向有关，
+        因此反向路径视为不同的路径。空路径忽略。
+        """
+        return tuple(sorted(tuple(node.index for node in route.sequence)
+                            for route in self.routes if route.sequence))
+        
+    def mutable_route(self, route_idx: int) -> Route:
+        """取得可修改的路径，必要时先复制共享路径"""
+        route = self.routes[route_idx]
+        if self._owned is not None and route not in self._owned:
+            route = route.copy()
+            self.routes[route_idx] = route
+            self._owned.add(route)
+        return route
+
+
+class RouteMetrics(NamedTuple):
+    """单条路径的评估结果"""
+    distance: float
+    load: float
+    time: float
+    battery_consumption: float
+    violation_count: int
+    violation_mask: int
+    cost: float
+
+
+class RouteCache:
+    """路径评估结果的LRU缓存，键为路径的节点索引元组"""
+    
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+        
+    def get(self, key: tuple) -> RouteMetrics:
+        """查询缓存，命中时将条目移到最近使用端"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+        
+    def put(self, key: tuple, metrics: RouteMetrics):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        self.entries[key] = metrics
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+            
+    def stats(self) -> Dict[str, int]:
+        """返回累计的命中/未命中/淘汰次数"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+def apply_route_metrics(route: Route, metrics: RouteMetrics):
+    """把评估结果写回路径对象"""
+    route.total_distance = metrics.distance
+    route.total_load = metrics.load
+    route.total_time = metrics.time
+    route.battery_consumption = metrics.battery_consumption
+    route.is_feasible = metrics.violation_count == 0
+    route.violation_count = metrics.violation_count
+    route.violation_mask = metrics.violation_mask
+    route.violations = [] if route.is_feasible else None  # 需要时再生成描述
+    route.cost = metrics.cost
+    route.dirty = False
+
+
+class CompactSolution:
+    """数组形式的解决方案（染色体）
+    
+    tour为int32巨型路径（只含客户和充电站的稠密索引，不含配送中心），
+    第r条路径为tour[offsets[r]:offsets[r+1]]；metrics每行对应一条路径，
+    列依次为RouteMetrics的各字段。复制只需几次ndarray.copy()。
+    """
+    
+    __slots__ = ('tour', 'offsets', 'metrics', 'total_cost', 'fitness', 'is_feasible')
+    
+    METRIC_FIELDS = RouteMetrics._fields
+    
+    def __init__(self, tour: np.ndarray, offsets: np.ndarray, metrics: np.ndarray = None):
+        self.tour = np.asarray(tour, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        if metrics is None:
+            metrics = np.zeros((len(self.offsets) - 1, len(self.METRIC_FIELDS)))
+        self.metrics = metrics
+        self.total_cost = 0.0
+        self.fitness = 0.0
+        self.is_feasible = True
+        
+    @property
+    def num_routes(self) -> int:
+        return len(self.offsets) - 1
+        
+    def route(self, r: int) -> np.ndarray:
+        """第r条路径的节点索引"""
+        return self.tour[self.offsets[r]:self.offsets[r + 1]]
+        
+    def metric(self, name: str) -> np.ndarray:
+        """按字段名取出所有路径的某项指标"""
+        return self.metrics[:, self.METRIC_FIELDS.index(name)]
+        
+    def copy(self) -> 'CompactSolution':
+        """创建副本"""
+        new_solution = CompactSolution(self.tour.copy(), self.offsets.copy(), self.metrics.copy())
+        new_solution.total_cost = self.total_cost
+        new_solution.fitness = self.fitness
+        new_solution.is_feasible = self.is_feasible
+        return new_solution
+        
+    @classmethod
+    def from_solution(cls, solution: EVRPSolution) -> 'CompactSolution':
+        """由对象形式的解决方案转换"""
+        lengths = [len(route.sequence) for route in solution.routes]
+        tour = [node.index for route in solution.routes for node in route.sequence]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum(lengths)
+        metrics = np.array([[route.total_distance, route.total_load, route.total_time,
+                             route.battery_consumption, route.violation_count, route.violation_mask,
+                             route.total_distance + VIOLATION_PENALTY * route.violation_count]
+                            for route in solution.routes]).reshape(len(lengths), len(cls.METRIC_FIELDS))
+        compact = cls(np.array(tour, dtype=np.int32), offsets, metrics)
+        compact.total_cost = solution.total_cost
+        compact.fitness = solution.fitness
+        compact.is_feasible = solution.is_feasible
+        return compact
+        
+    def to_solution(self, problem: EVRPProblem) -> EVRPSolution:
+        """转换为对象形式的解决方案（用于可视化和JSON输出）"""
+        problem.compile()
+        solution = EVRPSolution(problem)
+        for r, values in enumerate(self.metrics.tolist()):
+            route = Route(problem)
+            route.sequence = [problem.nodes[j] for j in self.route(r).tolist()]
+            metrics = RouteMetrics(*values[:4], int(values[4]), int(values[5]), values[6])
+            apply_route_metrics(route, metrics)
+            solution.routes.append(route)
+        solution.total_cost = self.total_cost
+        solution.fitness = self.fitness
+        solution.is_feasible = self.is_feasible
+        return solution
 
 
 class EVRPEvaluator:
-    """EVRP评估器"""
+    """EVRP评估器
     
-    def __init__(self, problem: EVRPProblem):
-        self.problem = problem
+    fast_mode为True时只记录违反约束的次数和类型位掩码，不构造描述字符串；
+    描述在保存结果或可视化访问route.violations时才由describe_violations生成。
+    """
+    
+    def __init__(self, problem: EVRPProblem, cache_size: int = 0, fast_mode: bool = False):
+        self.problem = problem.compile()
+        self.cache = RouteCache(cache_size)
+        self.fast_mode = fast_mode
         
     def evaluate_route(self, route: Route) -> float:
         """评估单条路径的可行性和成本"""
         if len(route.sequence) == 0:
             return 0.0
+        self.problem.check_nodes(route.sequence)
+            
+        if self.cache.enabled:
+            key = tuple([node.index for node in route.sequence])
+            metrics = self.cache.get(key)
+            if metrics is None:
+                metrics, violations = self._simulate(route, describe=not self.fast_mode)
+                self.cache.put(key, metrics)
+            else:
+                violations = None
+        else:
+            metrics, violations = self._simulate(route, describe=not self.fast_mode)
             
-        route.total_distance = 0.0
-        route.total_load = 0.0
-        route.total_time = 0.0
-        route.battery_consumption = 0.0
-        route.is_feasible = True
-        route.violations = []
+        apply_route_metrics(route, metrics)
+        if violations is not None:
+            route.violations = violations
+        return metrics.cost
+        
+    def describe_violations(self, route: Route) -> List[str]:
+        """生成路径违反约束的文字描述"""
+        if len(route.sequence) == 0:
+            return []
+        self.problem.check_nodes(route.sequence)
+        return self._simulate(route, describe=True)[1]
+        
+    def _simulate(self, route: Route, describe: bool) -> Tuple[RouteMetrics, List[str]]:
+        """沿路径逐点模拟载重、电量和时间；describe为False时不生成违反描述"""
+        problem = self.problem.compile()
+        distance_rows = problem.distance_rows
+        rate = problem.consumption_rate
+        speed = problem.speed
+        
+        total_distance = 0.0
+        battery_consumption = 0.0
+        violation_count = 0
+        violation_mask = 0
+        violations = [] if describe else None
         
         current_load = 0.0
-        current_battery = self.problem.vehicle_battery
+        current_battery = problem.vehicle_battery
         current_time = 0.0
         
-        prev_node = self.problem.depot
+        prev = problem.depot.index
         
-        for i, node in enumerate(route.sequence):
-            distance = self.problem.calculate_distance(prev_node, node)
-            energy_needed = distance * self.problem.consumption_rate
+        for node in route.sequence:
+            j = node.index
+            distance = distance_rows[prev][j]
+            energy_needed = distance * rate
             
             # 检查电池电量
             if current_battery < energy_needed:
-                route.is_feasible = False
-                route.violations.append(f"电池电量不足在节点{node.id}")
+                violation_count += 1
+                violation_mask |= VIOLATION_BATTERY
+                if describe:
+                    violations.append(f"电池电量不足在节点{node.id}")
                 
+            node_type = node.node_type
+            
             # 检查载重
-            if hasattr(node, 'demand'):
-                if current_load + node.demand > self.problem.vehicle_capacity:
-                    route.is_feasible = False
-                    route.violations.append(f"超载在节点{node.id}")
+            if node_type == NODE_CUSTOMER:
+                if current_load + node.demand > problem.vehicle_capacity:
+                    violation_count += 1
+                    violation_mask |= VIOLATION_CAPACITY
+                    if describe:
+                        violations.append(f"超载在节点{node.id}")
                 current_load += node.demand
                 
             # 更新时间和电池
-            travel_time = distance / self.problem.speed
+            travel_time = distance / speed
             current_time += travel_time
             current_battery -= energy_needed
             
             # 如果是充电站
-            if isinstance(node, ChargingStation):
+            if node_type == NODE_STATION:
                 # 计算需要充电的时间
-                charge_needed = self.problem.vehicle_battery - current_battery
+                charge_needed = problem.vehicle_battery - current_battery
                 charge_time = charge_needed / node.charging_rate
                 current_time += charge_time
-                current_battery = self.problem.vehicle_battery
+                current_battery = problem.vehicle_battery
                 
             # 如果是客户
-            if isinstance(node, Customer):
+            if node_type == NODE_CUSTOMER:
                 # 检查时间窗
                 if not (node.time_window[0] <= current_time <= node.time_window[1]):
-                    route.is_feasible = False
-                    route.violations.append(f"违反时间窗在客户{node.id}")
+                    violation_count += 1
+                    violation_mask |= VIOLATION_TIME_WINDOW
+                    if describe:
+                        violations.append(f"违反时间窗在客户{node.id}")
                 current_time += node.service_time
                 
-            route.total_distance += distance
-            prev_node = node
+            total_distance += distance
+            battery_consumption += energy_needed
+            prev = j
             
         # 返回配送中心
-        if len(route.sequence) > 0:
-            distance = self.problem.calculate_distance(route.sequence[-1], self.problem.depot)
-            route.total_distance += distance
+        depot = problem.depot.index
+        distance = distance_rows[prev][depot]
+        total_distance += distance
+        battery_consumption += distance * rate
+        current_time += distance / speed
             
         # 计算成本
-        cost = route.total_distance
-        if not route.is_feasible:
-            cost += 1000 * len(route.violations)  # 惩罚成本
+        cost = total_distance
+        if violation_count > 0:
+            cost += VIOLATION_PENALTY * violation_count  # 惩罚成本
             
-        return cost
+        metrics = RouteMetrics(total_distance, current_load, current_time, battery_consumption,
+                               violation_count, violation_mask, cost)
+        return metrics, violations
+        
+    def route_profile(self, route: Route) -> RouteProfile:
+        """获取路径的资源剖面，缓存失效（route.profile为None）时重新计算
+        
+        剖面只通过Route.invalidate()或整体替换sequence失效，原地修改序列后必须调用invalidate()。
+        """
+        profile = route.profile
+        if profile is None:
+            profile = self.build_route_profile(route)
+            route.profile = profile
+        return profile
+        
+    def build_route_profile(self, route: Route) -> RouteProfile:
+        """计算路径的前缀/后缀资源数组（与evaluate_route的计算规则一致）"""
+        problem = self.problem.compile()
+        problem.check_nodes(route.sequence)
+        distance_rows = problem.distance_rows
+        rate = problem.consumption_rate
+        speed = problem.speed
+        battery_capacity = problem.vehicle_battery
+        depot = problem.depot.index
+        
+        n = len(route.sequence) + 2
+        profile = RouteProfile(n, battery_capacity)
+        profile.nodes[0] = depot
+        profile.nodes[n - 1] = depot
+        battery_violation = [0] * n
+        
+        for k in range(1, n):
+            node = route.sequence[k - 1] if k < n - 1 else problem.depot
+            j = node.index
+            profile.nodes[k] = j
+            prev = profile.nodes[k - 1]
+            violations = 0
+            
+            distance = distance_rows[prev][j]
+            energy_needed = distance * rate
+            if k < n - 1 and profile.battery_out[k - 1] < energy_needed:
+                violations += 1
+                battery_violation[k] = 1
+            profile.distance[k] = profile.distance[k - 1] + distance
+            profile.arrival[k] = profile.departure[k - 1] + distance / speed
+            profile.battery[k] = profile.battery_out[k - 1] - energy_needed
+            profile.load[k] = profile.load[k - 1]
+            profile.departure[k] = profile.arrival[k]
+            profile.battery_out[k] = profile.battery[k]
+            
+            if node.node_type == NODE_CUSTOMER:
+                profile.load[k] += node.demand
+                if profile.load[k] > problem.vehicle_capacity:
+                    violations += 1
+                if not (node.time_window[0] <= profile.arrival[k] <= node.time_window[1]):
+                    violations += 1
+                profile.departure[k] += node.service_time
+            elif node.node_type == NODE_STATION:
+                profile.departure[k] += (battery_capacity - profile.battery[k]) / node.charging_rate
+                profile.battery_out[k] = battery_capacity
+                
+            profile.violations[k] = profile.violations[k - 1] + violations
+            
+        # 后缀：充电点位置与时间窗松弛量
+        for k in range(n - 1, 0, -1):
+            node = route.sequence[k - 1] if k < n - 1 else problem.depot
+            profile.late_suffix[k] = profile.late_suffix[k + 1]
+            profile.early_suffix[k] = profile.early_suffix[k + 1]
+            profile.battery_violations_suffix[k] = (profile.battery_violations_suffix[k + 1] +
+                                                    battery_violation[k])
+            if node.node_type != NODE_CUSTOMER:
+                profile.charge_pos[k] = k
+                continue
+                
+            profile.charge_pos[k] = profile.charge_pos[k + 1]
+            profile.late_segment[k] = profile.late_segment[k + 1]
+            profile.early_segment[k] = profile.early_segment[k + 1]
+            if node.node_type == NODE_CUSTOMER:
+                late_slack = node.time_window[1] - profile.arrival[k]
+                early_slack = profile.arrival[k] - node.time_window[0]
+                profile.late_segment[k] = min(profile.late_segment[k], late_slack)
+                profile.early_segment[k] = min(profile.early_segment[k], early_slack)
+                profile.late_suffix[k] = min(profile.late_suffix[k], late_slack)
+                profile.early_suffix[k] = min(profile.early_suffix[k], early_slack)
+                
+        return profile
+        
+    def _extend(self, state: Tuple[int, float, float, float], node):
+        """从状态(节点, 离开时间, 离开电量, 载重)出发访问node，违反约束时返回None"""
+        problem = self.problem
+        prev, departure, battery, load = state
+        j = node.index
+        distance = problem.distance_rows[prev][j]
+        energy_needed = distance * problem.consumption_rate
+        if battery < energy_needed:
+            return None
+        arrival = departure + distance / problem.speed
+        battery -= energy_needed
+        
+        if node.node_type == NODE_CUSTOMER:
+            load += node.demand
+            if load > problem.vehicle_capacity:
+                return None
+            if not (node.time_window[0] <= arrival <= node.time_window[1]):
+                return None
+            return j, arrival + node.service_time, battery, load
+        if node.node_type == NODE_STATION:
+            charge_time = (problem.vehicle_battery - battery) / node.charging_rate
+            return j, arrival + charge_time, problem.vehicle_battery, load
+        return j, arrival, battery, load
+        
+    def _suffix_feasible(self, profile: RouteProfile, k: int, state: Tuple[int, float, float, float]) -> bool:
+        """从状态出发接上剖面位置k及之后的后缀，O(1)判断结果是否可行
+        
+        后缀在下一个充电点之前整体平移到达时间和电量；充电点之后电量
+        已充满，只剩一次统一的时间平移。
+        """
+        problem = self.problem
+        prev, departure, battery, load = state
+        n = len(profile.nodes)
+        j = profile.nodes[k]
+        
+        # 载重
+        if load + profile.load[n - 1] - profile.load[k - 1] > problem.vehicle_capacity:
+            return False
+            
+        # 电量：充电点之前电量单调下降，检查最后一个受检位置（返回配送中心的弧不检查）
+        distance = problem.distance_rows[prev][j]
+        delta_battery = battery - distance * problem.consumption_rate - profile.battery[k]
+        c = profile.charge_pos[k]
+        last = c if c < n - 1 else c - 1
+        if last >= k and profile.battery[last] + delta_battery < 0:
+            return False
+            
+        # 时间窗：充电点之前平移delta_time
+        delta_time = departure + distance / problem.speed - profile.arrival[k]
+        if delta_time > profile.late_segment[k] or -delta_time > profile.early_segment[k]:
+            return False
+            
+        if c < n - 1:
+            # 充电点之后：电量充满，平移量加上充电时间的变化
+            station = problem.nodes[profile.nodes[c]]
+            charge_time = (problem.vehicle_battery - profile.battery[c] - delta_battery) / station.charging_rate
+            shift = profile.arrival[c] + delta_time + charge_time - profile.departure[c]
+            if shift > profile.late_suffix[c + 1] or -shift > profile.early_suffix[c + 1]:
+                return False
+            if profile.battery_violations_suffix[c + 1] > 0:
+                return False
+                
+        return True
+        
+    def _prefix_state(self, profile: RouteProfile, k: int):
+        """剖面位置k处的离开状态；前缀已有违反约束时返回None"""
+        if profile.violations[k] > 0:
+            return None
+        return profile.nodes[k], profile.departure[k], profile.battery_out[k], profile.load[k]
+        
+    def evaluate_insertion(self, route: Route, node, position: int) -> MoveEvaluation:
+        """O(1)评估把node插入到route.sequence[position]之前"""
+        profile = self.route_profile(route)
+        distance_rows = self.problem.distance_rows
+        a, b = profile.nodes[position], profile.nodes[position + 1]
+        j = node.index
+        delta = distance_rows[a][j] + distance_rows[j][b] - distance_rows[a][b]
+        
+        state = self._prefix_state(profile, position)
+        if state is not None:
+            state = self._extend(state, node)
+        feasible = state is not None and self._suffix_feasible(profile, position + 1, state)
+        return MoveEvaluation(delta, feasible)
+        
+    def evaluate_removal(self, route: Route, position: int) -> MoveEvaluation:
+        """O(1)评估移除route.sequence[position]"""
+        profile = self.route_profile(route)
+        distance_rows = self.problem.distance_rows
+        a, j, b = profile.nodes[position], profile.nodes[position + 1], profile.nodes[position + 2]
+        delta = distance_rows[a][b] - distance_rows[a][j] - distance_rows[j][b]
+        
+        state = self._prefix_state(profile, position)
+        feasible = state is not None and self._suffix_feasible(profile, position + 2, state)
+        return MoveEvaluation(delta, feasible)
+        
+    def evaluate_relocation(self, from_route: Route, from_position: int,
+                            to_route: Route, to_position: int) -> MoveEvaluation:
+        """评估把from_route.sequence[from_position]移到to_route.sequence[to_position]之前
+        
+        不同路径之间为O(1)；同一路径内移动时to_position指移除后序列中的位置，
+        由于中间段顺序改变，退化为O(L)重新计算。
+        """
+        node = from_route.sequence[from_position]
+        if from_route is not to_route:
+            removal = self.evaluate_removal(from_route, from_position)
+            insertion = self.evaluate_insertion(to_route, node, to_position)
+            return MoveEvaluation(removal.delta_distance + insertion.delta_distance,
+                                  removal.feasible and insertion.feasible)
+            
+        moved = Route(self.problem)
+        moved.sequence = from_route.sequence.copy()
+        moved.sequence.pop(from_position)
+        moved.sequence.insert(to_position, node)
+        self.evaluate_route(moved)
+        original = self.route_profile(from_route).distance[-1]
+        return MoveEvaluation(moved.total_distance - original, moved.is_feasible)
         
     def evaluate_solution(self, solution: EVRPSolution) -> float:
         """评估整个解决方案"""
         solution.total_cost = 0.0
         solution.is_feasible = True
         
+        # 上次评估后未被修改的路径直接沿用其成本
         for route in solution.routes:
-            route_cost = self.evaluate_route(route)
+            route_cost = self.evaluate_route(route) if route.dirty else route.cost
             solution.total_cost += route_cost
             if not route.is_feasible:
                 solution.is_feasible = False
@@ -229,44 +863,376 @@ class EVRPEvaluator:
         if solution.is_feasible:
             solution.fitness = 1.0 / (1.0 + solution.total_cost)
         else:
-            solution.fitness = 1.0 / (1.0 + solution.total_cost + 1000)
+            solution.fitness = 1.0 / (1.0 + solution.total_cost + VIOLATION_PENALTY)
             
         return solution.total_cost
 
 
+class EVRPBatchEvaluator:
+    """EVRP批量评估器
+    
+    将整代种群的路径编码为填充后的整数索引矩阵（每行一条路径，
+    末尾至少补一列配送中心索引0表示返回），一次性取出所有弧的
+    距离/能耗/时间，载重和距离用累加直接得到；电量和时间在充电站
+    处会重置，按列推进但对所有路径同时做数组运算。
+    计算顺序与EVRPEvaluator.evaluate_route逐项一致，结果完全相同。
+    """
+    
+    def __init__(self, problem: EVRPProblem, cache: RouteCache = None):
+        self.problem = problem.compile()
+        self.cache = cache if cache is not None else RouteCache(0)  # 通常与EVRPEvaluator共享
+        
+    def encode_routes(self, routes: List[Route]) -> Tuple[np.ndarray, np.ndarray]:
+        """将路径列表编码为填充索引矩阵和路径长度数组"""
+        for route in routes:
+            self.problem.check_nodes(route.sequence)
+        return self.encode_sequences([[node.index for node in route.sequence] for route in routes])
+        
+    def encode_sequences(self, sequences: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """将节点索引序列编码为填充索引矩阵和路径长度数组"""
+        lengths = np.array([len(seq) for seq in sequences], dtype=np.int64)
+        width = int(lengths.max()) + 1 if len(sequences) > 0 else 1
+        index_matrix = np.full((len(sequences), width), self.problem.depot.index, dtype=np.int32)
+        flat = [j for seq in sequences for j in seq]
+        index_matrix[np.arange(width) < lengths[:, None]] = flat
+        return index_matrix, lengths
+        
+    def evaluate_routes(self, index_matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """向量化评估一批路径，返回各项指标数组"""
+        problem = self.problem.compile()
+        depot = problem.depot.index
+        battery_capacity = problem.vehicle_battery
+        
+        # 转置为(位置, 路径)，按列推进时内存连续；最后一列保证返回配送中心
+        nodes = np.empty((index_matrix.shape[1] + 1, index_matrix.shape[0]), dtype=np.intp)
+        nodes[:-1] = index_matrix.T
+        nodes[-1] = depot
+        prev = np.empty_like(nodes)
+        prev[0] = depot
+        prev[1:] = nodes[:-1]
+        
+        # 能耗和时间矩阵由距离矩阵逐元素算得，这里同样计算可省去两次随机访问
+        step_distance = problem.distance_matrix.ravel()[prev * problem.distance_matrix.shape[1] + nodes]
+        step_energy = step_distance * problem.consumption_rate
+        step_time = step_distance / problem.speed
+        
+        # 节点属性一次性取出：(属性, 位置, 路径)
+        attributes = np.stack([problem.demands, problem.service_times, problem.tw_early,
+                               problem.tw_late, problem.charging_rates, problem.node_types])
+        demand, service_time, tw_early, tw_late, charging_rate, node_type = np.take(attributes, nodes, axis=1)
+        is_customer = node_type == NODE_CUSTOMER
+        is_station = node_type == NODE_STATION
+        not_depot = node_type != NODE_DEPOT
+        
+        num_routes = index_matrix.shape[0]
+        distance = np.zeros(num_routes)
+        energy = np.zeros(num_routes)
+        load = np.zeros(num_routes)
+        battery = np.full(num_routes, float(battery_capacity))
+        current_time = np.zeros(num_routes)
+        violations = np.zeros(num_routes, dtype=np.int64)
+        violation_mask = np.zeros(num_routes, dtype=np.int64)
+        
+        for k in range(nodes.shape[0]):
+            # 电池电量（返回配送中心的弧不检查）
+            violated = (battery < step_energy[k]) & not_depot[k]
+            violations += violated
+            violation_mask |= violated * VIOLATION_BATTERY
+            
+            # 载重（非客户节点需求为0）
+            load += demand[k]
+            violated = (load > problem.vehicle_capacity) & is_customer[k]
+            violations += violated
+            violation_mask |= violated * VIOLATION_CAPACITY
+            
+            current_time += step_time[k]
+            battery -= step_energy[k]
+            
+            # 充电站：充满电
+            current_time += (battery_capacity - battery) / charging_rate[k] * is_station[k]
+            battery = np.where(is_station[k], battery_capacity, battery)
+            
+            # 时间窗（非客户节点的时间窗为无穷区间）和服务时间
+            violated = (current_time < tw_early[k]) | (current_time > tw_late[k])
+            violations += violated
+            violation_mask |= violated * VIOLATION_TIME_WINDOW
+            current_time += service_time[k]
+            
+            distance += step_distance[k]
+            energy += step_energy[k]
+            
+        cost = np.where(violations > 0, distance + VIOLATION_PENALTY * violations, distance)
+        
+        return {
+            'distance': distance,
+            'load': load,
+            'time': current_time,
+            'battery_consumption': energy,
+            'violations': violations,
+            'violation_mask': violation_mask,
+            'cost': cost,
+        }
+        
+    def evaluate_sequences(self, sequences: List[List[int]]) -> List[RouteMetrics]:
+        """评估一批节点索引序列，缓存命中的直接返回，其余向量化计算后写入缓存"""
+        metrics = [None] * len(sequences)
+        pending = []
+        
+        for i, sequence in enumerate(sequences):
+            if not sequence:
+                metrics[i] = RouteMetrics(0.0, 0.0, 0.0, 0.0, 0, 0, 0.0)
+            elif self.cache.enabled:
+                key = tuple(sequence)
+                metrics[i] = self.cache.get(key)
+                if metrics[i] is None:
+                    pending.append(i)
+            else:
+                pending.append(i)
+                
+        if pending:
+            computed = self.compute_metrics([sequences[i] for i in pending])
+            for i, values in zip(pending, computed):
+                metrics[i] = RouteMetrics(*values)
+                if self.cache.enabled:
+                    self.cache.put(tuple(sequences[i]), metrics[i])
+                    
+        return metrics
+        
+    def compute_metrics(self, sequences: List[List[int]]):
+        """计算一批非空序列的指标（不查缓存），按RouteMetrics字段顺序返回元组"""
+        results = self.evaluate_routes(self.encode_sequences(sequences)[0])
+        return zip(results['distance'].tolist(), results['load'].tolist(),
+                   results['time'].tolist(), results['battery_consumption'].tolist(),
+                   results['violations'].tolist(), results['violation_mask'].tolist(),
+                   results['cost'].tolist())
+        
+    def encode_compact(self, population: List[CompactSolution]) -> Tuple[np.ndarray, np.ndarray]:
+        """将数组形式的种群直接编码为填充索引矩阵（无逐节点的Python循环）"""
+        lengths = np.concatenate([np.diff(solution.offsets) for solution in population]).astype(np.int64)
+        width = int(lengths.max()) + 1 if len(lengths) > 0 else 1
+        index_matrix = np.full((len(lengths), width), self.problem.depot.index, dtype=np.int32)
+        index_matrix[np.arange(width) < lengths[:, None]] = np.concatenate(
+            [solution.tour for solution in population])
+        return index_matrix, lengths
+        
+    def evaluate_compact(self, population: List[CompactSolution]) -> np.ndarray:
+        """评估数组形式的种群，结果写入各解的metrics数组"""
+        if not population:
+            return np.empty(0)
+        index_matrix, lengths = self.encode_compact(population)
+        results = self.evaluate_routes(index_matrix)
+        metrics = np.column_stack([results[name] for name in
+                                   ('distance', 'load', 'time', 'battery_consumption',
+                                    'violations', 'violation_mask', 'cost')]).astype(float)
+        metrics[lengths == 0] = 0.0
+        
+        total_costs = np.empty(len(population))
+        start = 0
+        for i, solution in enumerate(population):
+            end = start + solution.num_routes
+            solution.metrics = metrics[start:end]
+            total_cost = 0.0
+            for cost in metrics[start:end, -1].tolist():
+                total_cost += cost
+            solution.total_cost = total_cost
+            solution.is_feasible = not metrics[start:end, 4].any()
+            if solution.is_feasible:
+                solution.fitness = 1.0 / (1.0 + total_cost)
+            else:
+                solution.fitness = 1.0 / (1.0 + total_cost + VIOLATION_PENALTY)
+            total_costs[i] = total_cost
+            start = end
+            
+        return total_costs
+        
+    def evaluate_population(self, population: List[EVRPSolution]) -> np.ndarray:
+        """一次评估整个种群，并把结果写回路径和解决方案对象
+        
+        只计算上次评估后被修改过的路径（同一路径对象可能被多个解共享，只算一次），
+        其余路径沿用缓存的成本。
+        """
+        dirty = {}
+        for solution in population:
+            for route in solution.routes:
+                if route.dirty:
+                    dirty[id(route)] = route
+        dirty = list(dirty.values())
+        for route in dirty:
+            self.problem.check_nodes(route.sequence)
+        metrics = self.evaluate_sequences([[node.index for node in route.sequence] for route in dirty])
+        for route, route_metrics in zip(dirty, metrics):
+            if route.sequence:
+                apply_route_metrics(route, route_metrics)
+        
+        total_costs = np.empty(len(population))
+        for i, solution in enumerate(population):
+            total_cost = 0.0
+            is_feasible = True
+            for route in solution.routes:
+                if route.sequence:
+                    total_cost += route.cost
+                if not route.is_feasible:
+                    is_feasible = False
+            solution.total_cost = total_cost
+            solution.is_feasible = is_feasible
+                
+            if solution.is_feasible:
+                solution.fitness = 1.0 / (1.0 + solution.total_cost)
+            else:
+                solution.fitness = 1.0 / (1.0 + solution.total_cost + VIOLATION_PENALTY)
+            total_costs[i] = solution.total_cost
+            
+        return total_costs
+
+
+class ImprovementEvent(NamedTuple):
+    """solve_iter产生的最优解改进记录"""
+    solution: 'EVRPSolution'
+    cost: float
+    generation: int      # 初始种群为-1
+    timestamp: float     # time.time()时间戳
+    elapsed: float       # 距求解开始的秒数
+    evaluations: int     # 累计评估的解数量
+
+
 class EVRPGeneticAlgorithm:
     """EVRP遗传算法求解器"""
     
     def __init__(self, problem: EVRPProblem, population_size: int = 100,
                  max_generations: int = 1000, crossover_rate: float = 0.8,
-                 mutation_rate: float = 0.1, elite_size: int = 10):
+                 mutation_rate: float = 0.1, elite_size: int = 10,
+                 batch_evaluation: bool = False, route_cache_size: int = 10000,
+                 split_decoder: bool = True, num_workers: int = 0,
+                 checkpoint_path: str = None, checkpoint_interval: int = 0,
+                 checkpoint_seconds: float = 0.0, ga_mode: str = 'generational',
+                 steady_state_offspring: int = 2, replacement: str = 'worst',
+                 local_search_rate: float = 0.0, local_search_neighbors: int = 10,
+                 charging_placement: str = 'infeasible', reject_clones: bool = True,
+                 construction_share: float = 0.0, crossover_operator: str = 'routes',
+                 repair_method: str = 'regret', regret_k: int = 3,
+                 operator_selection: str = 'uniform'):
         self.problem = problem
         self.population_size = population_size
         self.max_generations = max_generations
         self.crossover_rate = crossover_rate
         self.mutation_rate = mutation_rate
         self.elite_size = elite_size
+        self.batch_evaluation = batch_evaluation  # 是否整代向量化评估
+        self.num_workers = num_workers  # 并行评估进程数，0或1表示串行
+        self.checkpoint_path = checkpoint_path  # 检查点文件，None表示不保存
+        self.checkpoint_interval = checkpoint_interval  # 每隔多少代保存，0表示不按代数
+        self.checkpoint_seconds = checkpoint_seconds  # 每隔多少秒保存，0表示不按时间
+        if ga_mode not in ('generational', 'steady_state'):
+            raise ValueError(f"未知的进化模式: {ga_mode}")
+        if replacement not in ('worst', 'similar'):
+            raise ValueError(f"未知的替换策略: {replacement}")
+        if charging_placement not in ('none', 'infeasible', 'all'):
+            raise ValueError(f"未知的充电站布置方式: {charging_placement}")
+        if crossover_operator not in ('routes', 'ox', 'pmx', 'erx', 'srex'):
+            raise ValueError(f"未知的交叉算子: {crossover_operator}")
+        if repair_method not in ('greedy', 'regret'):
+            raise ValueError(f"未知的修复方式: {repair_method}")
+        if operator_selection not in ('uniform', 'roulette', 'ucb'):
+            raise ValueError(f"未知的算子选择方式: {operator_selection}")
+        self.ga_mode = ga_mode  # generational: 整代替换; steady_state: 稳态逐个替换
+        self.steady_state_offspring = steady_state_offspring  # 稳态模式每步产生的子代数
+        self.replacement = replacement  # 稳态替换策略: 最差个体或最相似的亲本
+        self.local_search_rate = local_search_rate  # 子代接受局部搜索（教育）的概率
         
-        self.evaluator = EVRPEvaluator(problem)
+        self.evaluator = EVRPEvaluator(problem, cache_size=route_cache_size, fast_mode=True)
+        if num_workers > 1:
+            from evrp_parallel import ParallelBatchEvaluator
+            self.batch_evaluator = ParallelBatchEvaluator(problem, cache=self.evaluator.cache,
+                                                          num_workers=num_workers)
+        else:
+            self.batch_evaluator = EVRPBatchEvaluator(problem, cache=self.evaluator.cache)
+        self.split_decoder = None
+        if split_decoder:
+            from evrp_split import SplitDecoder
+            self.split_decoder = SplitDecoder(problem)  # 巨型路径最优分割解码
+        self.crossover_operator = crossover_operator  # routes: 路径交换+修复; 其余为巨型路径交叉
+        self.tour_crossover = None
+        if crossover_operator != 'routes':
+            from evrp_crossover import GiantTourCrossover
+            self.tour_crossover = GiantTourCrossover(problem, self.split_decoder, crossover_operator)
+        self.repair_method = repair_method  # greedy: 逐个最优插入; regret: 后悔值插入
+        self.regret_insertion = None
+        if repair_method == 'regret':
+            from evrp_repair import RegretInsertion
+            self.regret_insertion = RegretInsertion(problem, self.evaluator, k=regret_k)
+        from evrp_adaptive import OperatorSelector
+        self.operator_selection = operator_selection  # 变异算子的选择方式: uniform / roulette / ucb
+        self.operator_selector = OperatorSelector(['swap', 'relocate', 'reverse'], tracked=['crossover'],
+                                                  rule=operator_selection)
+        self.operator_log = {}  # id(子代) -> (子代, 亲本成本, 作用于子代的算子)，评估后记分
+        self.charging_placement = charging_placement  # 子代评估前的充电站布置方式
+        self.reject_clones = reject_clones  # 按规范表示去除重复个体，已知个体不再评估
+        self.construction_share = construction_share  # 初始种群中由节约法/扫描法构造的比例
+        self.clone_counts = {'offspring': 0, 'duplicates': 0, 'known': 0}  # 本代子代去重统计
+        self.charger_placer = None
+        if charging_placement != 'none':
+            from evrp_charging import ChargingPlacement
+            self.charger_placer = ChargingPlacement(problem, self.evaluator)
+        self.local_search = None
+        if local_search_rate > 0:
+            from evrp_local_search import LocalSearch
+            self.local_search = LocalSearch(problem, self.evaluator,
+                                            num_neighbors=local_search_neighbors)
         self.population = []
         self.best_solution = None
         self.generation_history = []
+        self.evaluations = 0  # 累计评估的解数量
+        self.stop_reason = None  # 最近一次求解的终止原因
         
-    def create_initial_population(self):
-        """创建初始种群"""
-        self.population = []
+    def create_initial_population(self, initial_solutions: List = None):
+        """创建初始种群
         
-        for _ in range(self.population_size):
-            solution = self.create_random_solution()
-            self.evaluator.evaluate_solution(solution)
-            self.population.append(solution)
+        Args:
+            initial_solutions: 热启动解，可以是EVRPSolution或客户排列（经分割解码）
+        """
+        self.population = [self.warm_start_solution(s) for s in (initial_solutions or [])]
+        self.population = self.population[:self.population_size]
+        num_constructed = min(int(round(self.construction_share * self.population_size)),
+                              self.population_size - len(self.population))
+        if num_constructed > 0:
+            from evrp_construct import InitialConstructor
+            constructor = InitialConstructor(self.problem, self.split_decoder)
+            self.population.extend(constructor.generate(num_constructed))
+        while len(self.population) < self.population_size:
+            self.population.append(self.create_random_solution())
+        self.evaluate_population(self.population)
             
         self.population.sort(key=lambda x: x.total_cost)
         self.best_solution = self.population[0].copy()
         
+    def evaluate_population(self, population: List[EVRPSolution]):
+        """评估一组解决方案（批量模式下整体向量化计算，并行模式下分块交给工作进程）"""
+        self.evaluations += len(population)
+        if self.batch_evaluation or self.num_workers > 1:
+            self.batch_evaluator.evaluate_population(population)
+        else:
+            for solution in population:
+                self.evaluator.evaluate_solution(solution)
+                
+    def warm_start_solution(self, initial) -> EVRPSolution:
+        """将热启动输入转换为解决方案"""
+        if isinstance(initial, EVRPSolution):
+            return initial.copy()
+        if self.split_decoder is not None:
+            return self.split_decoder.decode(initial)
+        from evrp_split import SplitDecoder
+        return SplitDecoder(self.problem).decode(initial)
+        
     def create_random_solution(self) -> EVRPSolution:
-        """创建随机解决方案"""
+        """创建随机解决方案（启用分割解码时对随机客户排列做最优分割）"""
+        if self.split_decoder is not None:
+            customers = self.problem.customers.copy()
+            random.shuffle(customers)
+            return self.split_decoder.decode(customers)
+            
         solution = EVRPSolution(self.problem)
+        distance_rows = self.problem.compile().distance_rows
+        rate = self.problem.consumption_rate
         
         # 获取所有客户
         customers = self.problem.customers.copy()
@@ -279,15 +1245,14 @@ class EVRPGeneticAlgorithm:
             current_battery = self.problem.vehicle_battery
             
             for customer in customers[:]:
-                if current_load + customer.demand <= self.problem.vehicle_battery:
+                if current_load + customer.demand <= self.problem.vehicle_capacity:
                     # 检查是否需要充电
                     if len(route.sequence) > 0:
                         last_node = route.sequence[-1]
                     else:
                         last_node = self.problem.depot
                         
-                    distance = self.problem.calculate_distance(last_node, customer)
-                    energy_needed = distance * self.problem.consumption_rate
+                    energy_needed = distance_rows[last_node.index][customer.index] * rate
                     
                     if current_battery >= energy_needed:
                         route.sequence.append(customer)
@@ -295,8 +1260,13 @@ class EVRPGeneticAlgorithm:
                         current_battery -= energy_needed
                         customers.remove(customer)
                     else:
-                        # 尝试插入充电站
-                        nearest_station = self.find_nearest_charging_station(customer)
+                        # 尝试插入绕行最短的可达充电站，没有时退回最近的充电站
+                        station = self.problem.detour_table().best_reachable(
+                            last_node.index, customer.index, current_battery)
+                        if station >= 0:
+                            nearest_station = self.problem.nodes[station]
+                        else:
+                            nearest_station = self.find_nearest_charging_station(customer)
                         if nearest_station:
                             route.sequence.append(nearest_station)
                             current_battery = self.problem.vehicle_battery
@@ -318,33 +1288,43 @@ class EVRPGeneticAlgorithm:
         if not self.problem.charging_stations:
             return None
             
-        nearest = min(self.problem.charging_stations,
-                     key=lambda s: self.problem.calculate_distance(node, s))
-        return nearest
+        problem = self.problem.compile()
+        return problem.nodes[problem.spatial_index().nearest_station(node.index)]
         
     def selection(self) -> List[EVRPSolution]:
         """选择操作 - 锦标赛选择"""
         selected = []
         
-        # 保留精英
-        selected.extend([sol.copy() for sol in self.population[:self.elite_size]])
+        # 保留精英（写时复制，只有被修改的路径才会真正复制）
+        selected.extend([sol.share() for sol in self.population[:self.elite_size]])
         
         # 锦标赛选择
         while len(selected) < self.population_size:
-            tournament = random.sample(self.population, 3)
-            winner = min(tournament, key=lambda x: x.total_cost)
-            selected.append(winner.copy())
+            selected.append(self.tournament_select().share())
             
         return selected
         
+    def tournament_select(self) -> EVRPSolution:
+        """锦标赛选出一个个体（不复制）"""
+        tournament = random.sample(self.population, min(3, len(self.population)))
+        return min(tournament, key=lambda x: x.total_cost)
+        
     def crossover(self, parent1: EVRPSolution, parent2: EVRPSolution) -> Tuple[EVRPSolution, EVRPSolution]:
-        """交叉操作 - 基于路径的交叉"""
-        child1 = parent1.copy()
-        child2 = parent2.copy()
+        """交叉操作 - 基于路径的交叉，或巨型路径交叉后分割解码（子代无需修复）"""
+        child1 = parent1.share()
+        child2 = parent2.share()
         
         if random.random() < self.crossover_rate:
+            start = time.process_time()
+            applied = False
+            if self.tour_crossover is not None:
+                child1 = self.tour_crossover.cross(parent1, parent2)
+                child2 = self.tour_crossover.cross(parent2, parent1)
+                applied = True
+                
             # 交换部分路径
-            if len(parent1.routes) > 1 and len(parent2.routes) > 1:
+            elif len(parent1.routes) > 1 and len(parent2.routes) > 1:
+                applied = True
                 cut1 = random.randint(1, len(parent1.routes) - 1)
                 cut2 = random.randint(1, len(parent2.routes) - 1)
                 
@@ -355,90 +1335,165 @@ class EVRPGeneticAlgorithm:
                 self.repair_solution(child1)
                 self.repair_solution(child2)
                 
+                # 按巨型路径重新最优分割
+                if self.split_decoder is not None:
+                    child1 = self.split_decoder.decode(self.split_decoder.giant_tour(child1))
+                    child2 = self.split_decoder.decode(self.split_decoder.giant_tour(child2))
+                    
+            # 实际交叉时两个子代各计一次调用、各分一半CPU时间（亲本只有一条路径时子代即亲本，不计）
+            if applied:
+                elapsed = (time.process_time() - start) / 2
+                for child, parent in ((child1, parent1), (child2, parent2)):
+                    self.log_operator('crossover', child, parent.total_cost, elapsed)
+                
         return child1, child2
         
     def mutation(self, solution: EVRPSolution):
         """变异操作"""
         if random.random() < self.mutation_rate:
-            mutation_type = random.choice(['swap', 'relocate', 'reverse'])
+            start = time.process_time()
+            mutation_type = self.operator_selector.select()
+            changed = False
             
             if mutation_type == 'swap' and solution.routes:
                 route_idx = random.randint(0, len(solution.routes) - 1)
                 route = solution.routes[route_idx]
                 if len(route.sequence) > 2:
+                    changed = True
+                    route = solution.mutable_route(route_idx)
                     i, j = random.sample(range(len(route.sequence)), 2)
                     route.sequence[i], route.sequence[j] = route.sequence[j], route.sequence[i]
+                    route.invalidate()
                     
             elif mutation_type == 'relocate' and solution.routes:
                 route_idx = random.randint(0, len(solution.routes) - 1)
                 route = solution.routes[route_idx]
                 if len(route.sequence) > 1:
+                    route = solution.mutable_route(route_idx)
                     pos = random.randint(0, len(route.sequence) - 1)
                     node = route.sequence.pop(pos)
+                    route.invalidate()
                     
                     # 插入到另一个位置
                     new_route_idx = random.randint(0, len(solution.routes) - 1)
                     new_pos = random.randint(0, len(solution.routes[new_route_idx].sequence))
-                    solution.routes[new_route_idx].sequence.insert(new_pos, node)
+                    new_route = solution.mutable_route(new_route_idx)
+                    new_route.sequence.insert(new_pos, node)
+                    new_route.invalidate()
+                    changed = new_route_idx != route_idx or new_pos != pos
                     
             elif mutation_type == 'reverse' and solution.routes:
                 route_idx = random.randint(0, len(solution.routes) - 1)
                 route = solution.routes[route_idx]
                 if len(route.sequence) > 2:
+                    changed = True
+                    route = solution.mutable_route(route_idx)
                     i, j = sorted(random.sample(range(len(route.sequence)), 2))
                     route.sequence[i:j+1] = reversed(route.sequence[i:j+1])
+                    route.invalidate()
                     
+            # 选中的路径太短等未改变子代的情况不计入算子统计
+            if changed:
+                self.log_operator(mutation_type, solution, solution.total_cost, time.process_time() - start)
+            
+    def log_operator(self, name: str, child: EVRPSolution, parent_cost: float, seconds: float):
+        """记录实际改变了子代的算子（计一次调用）和CPU时间，子代评估后再为算子记分"""
+        self.operator_selector.count(name)
+        entry = self.operator_log.get(id(child))
+        if entry is None:
+            entry = self.operator_log[id(child)] = (child, parent_cost, [])
+        entry[2].append(name)
+        self.operator_selector.add_time(name, seconds)
+        
+    def credit_operators(self, evaluated: List[EVRPSolution], rejected: List[EVRPSolution] = ()):
+        """按子代的评估结果为产生它们的算子记分，之后清空算子记录
+        
+        Args:
+            evaluated: 已评估（尚未局部搜索）的子代，与亲本比较成本，低于当前最优即为新最优
+            rejected: 作为重复个体被拒绝、未评估的子代
+        """
+        best_cost = self.best_solution.total_cost
+        for children, is_evaluated in ((evaluated, True), (rejected, False)):
+            for child in children:
+                entry = self.operator_log.get(id(child))
+                if entry is None:
+                    continue
+                _, parent_cost, names = entry
+                delta = child.total_cost - parent_cost if is_evaluated else None
+                new_best = is_evaluated and child.total_cost < best_cost
+                for name in names:
+                    self.operator_selector.record(name, delta, new_best)
+        self.operator_log.clear()
+        
     def repair_solution(self, solution: EVRPSolution):
         """修复不可行解"""
         # 简单的修复策略：移除重复客户，重新分配
+        # 未发生变化的路径直接沿用（可能与其他解共享），修改前先复制
         visited_customers = set()
         new_routes = []
+        owned = set()
         
         for route in solution.routes:
             new_route = Route(self.problem)
             for node in route.sequence:
-                if isinstance(node, Customer):
+                if node.node_type == NODE_CUSTOMER:
                     if node.id not in visited_customers:
                         new_route.sequence.append(node)
                         visited_customers.add(node.id)
                 else:
                     new_route.sequence.append(node)
                     
+            if len(new_route.sequence) == len(route.sequence):
+                new_route = route
+            else:
+                owned.add(new_route)
             if new_route.sequence:
                 new_routes.append(new_route)
                 
         # 处理未访问的客户
         all_customers = {c.id: c for c in self.problem.customers}
         unvisited = [c for cid, c in all_customers.items() if cid not in visited_customers]
-        
-        for customer in unvisited:
-            if not new_routes:
-                new_routes.append(Route(self.problem))
+        if self.regret_insertion is not None:
+            new_routes = self.regret_insertion.insert(new_routes, unvisited, owned)
+        else:
+            for customer in unvisited:
+                if not new_routes:
+                    new_routes.append(Route(self.problem))
+                    owned.add(new_routes[0])
+                    
+                # 找到最适合的路径插入
+                best_idx = 0
+                best_pos = len(new_routes[0].sequence)
+                min_cost = float('inf')
                 
-            # 找到最适合的路径插入
-            best_route = None
-            best_pos = 0
-            min_cost = float('inf')
-            
-            for route in new_routes:
-                for pos in range(len(route.sequence) + 1):
-                    new_route = route.copy()
-                    new_route.sequence.insert(pos, customer)
-                    cost = self.evaluator.evaluate_route(new_route)
-                    if cost < min_cost:
-                        min_cost = cost
-                        best_route = route
-                        best_pos = pos
-                        
-            if best_route:
+                for route_idx, route in enumerate(new_routes):
+                    for pos in range(len(route.sequence) + 1):
+                        cost = self.evaluator.evaluate_insertion(route, customer, pos).delta_cost
+                        if cost < min_cost:
+                            min_cost = cost
+                            best_idx = route_idx
+                            best_pos = pos
+                            
+                best_route = new_routes[best_idx]
+                if best_route not in owned:
+                    best_route = best_route.copy()
+                    new_routes[best_idx] = best_route
+                    owned.add(best_route)
                 best_route.sequence.insert(best_pos, customer)
-            else:
-                new_routes[0].sequence.append(customer)
-                
+                best_route.invalidate()
+                    
         solution.routes = [r for r in new_routes if r.sequence]
+        if solution._owned is not None:
+            solution._owned = owned
         
     def evolve(self):
         """进化一代"""
+        if self.ga_mode == 'steady_state':
+            self.evolve_steady_state()
+            return
+            
+        cache_before = self.evaluator.cache.stats()
+        
         # 选择
         new_population = self.selection()
         
@@ -449,12 +1504,16 @@ class EVRPGeneticAlgorithm:
                 child1, child2 = self.crossover(new_population[i], new_population[i+1])
                 self.mutation(child1)
                 self.mutation(child2)
-                
-                self.evaluator.evaluate_solution(child1)
-                self.evaluator.evaluate_solution(child2)
-                
                 offspring.extend([child1, child2])
                 
+        self.place_chargers(offspring)
+        if self.reject_clones:
+            offspring = self.next_population(offspring)
+        else:
+            self.evaluate_population(offspring)
+            self.credit_operators(offspring)
+            self.educate(offspring)
+            
         # 更新种群
         self.population = offspring
         self.population.sort(key=lambda x: x.total_cost)
@@ -463,6 +1522,185 @@ class EVRPGeneticAlgorithm:
         if self.population[0].total_cost < self.best_solution.total_cost:
             self.best_solution = self.population[0].copy()
             
+        self.record_generation(cache_before)
+        
+    def evolve_steady_state(self):
+        """稳态进化一代
+        
+        每步由两个锦标赛选出的亲本产生少量子代，逐个替换；一代的步数使子代总数
+        与整代模式相同。种群始终保持按成本升序，最优/最差个体分别在两端，
+        插入和定位用二分查找。
+        """
+        cache_before = self.evaluator.cache.stats()
+        steps = max(1, self.population_size // self.steady_state_offspring)
+        population_keys = None
+        if self.reject_clones:
+            population_keys = {}
+            for solution in self.population:
+                key = solution.canonical_key()
+                population_keys[key] = population_keys.get(key, 0) + 1
+        
+        for _ in range(steps):
+            parent1 = self.tournament_select()
+            parent2 = self.tournament_select()
+            
+            children = []
+            while len(children) < self.steady_state_offspring:
+                child1, child2 = self.crossover(parent1, parent2)
+                self.mutation(child1)
+                self.mutation(child2)
+                children.extend([child1, child2])
+            children = children[:self.steady_state_offspring]
+            
+            self.place_chargers(children)
+            rejected = []
+            if population_keys is not None:
+                accepted = self.reject_known(children, population_keys)
+                rejected = [child for child in children if all(child is not a for a in accepted)]
+                children = accepted
+            self.evaluate_population(children)
+            self.credit_operators(children, rejected)
+            self.educate(children)
+            for child in children:
+                removed = self.replace_individual(child, (parent1, parent2))
+                if removed is not None and population_keys is not None:
+                    self.update_population_keys(population_keys, child, removed)
+                
+        self.record_generation(cache_before)
+        
+    def next_population(self, offspring: List[EVRPSolution]) -> List[EVRPSolution]:
+        """去除重复子代并评估，返回下一代种群
+        
+        与当前种群中个体相同的子代直接沿用其评估结果；重复的子代被拒绝，
+        空缺由当前种群中不重复的较优个体补足，仍不足时补充新的随机个体，
+        返回的个体数始终等于子代数。
+        """
+        known = {}
+        for solution in self.population:
+            known.setdefault(solution.canonical_key(), solution)
+            
+        unique = []
+        seen = set()
+        to_evaluate = []
+        rejected = []
+        for child in offspring:
+            key = child.canonical_key()
+            if key in seen:
+                rejected.append(child)
+                continue
+            seen.add(key)
+            if key in known:
+                rejected.append(child)
+                child = known[key].share()
+            else:
+                to_evaluate.append(child)
+            unique.append(child)
+            
+        self.evaluate_population(to_evaluate)
+        self.credit_operators(to_evaluate, rejected)
+        self.educate(to_evaluate)
+        self.clone_counts['offspring'] += len(offspring)
+        self.clone_counts['duplicates'] += len(offspring) - len(unique)
+        self.clone_counts['known'] += len(unique) - len(to_evaluate)
+        
+        for solution in self.population:
+            if len(unique) >= len(offspring):
+                break
+            key = solution.canonical_key()
+            if key not in seen:
+                seen.add(key)
+                unique.append(solution.share())
+                
+        # 小规模实例中不同的解可能不够多，尝试一定次数后允许重复
+        fresh = []
+        attempts = 0
+        while len(unique) + len(fresh) < len(offspring):
+            solution = self.create_random_solution()
+            key = solution.canonical_key()
+            attempts += 1
+            if key in seen and attempts <= 2 * len(offspring):
+                continue
+            seen.add(key)
+            fresh.append(solution)
+        if fresh:
+            self.evaluate_population(fresh)
+            unique.extend(fresh)
+        return unique
+        
+    def place_chargers(self, offspring: List[EVRPSolution]):
+        """评估前对子代中被修改过的路径删除多余充电站或重新布置充电站"""
+        if self.charger_placer is None:
+            return
+        remove_redundant = self.charging_placement == 'all'
+        for child in offspring:
+            self.charger_placer.improve(child, remove_redundant)
+            
+    def educate(self, offspring: List[EVRPSolution]):
+        """以local_search_rate的概率对已评估的子代做局部搜索（模因算法的教育步骤）"""
+        if self.local_search is None:
+            return
+        for child in offspring:
+            if random.random() < self.local_search_rate:
+                self.local_search.improve(child)
+                
+    def reject_known(self, children: List[EVRPSolution], population_keys: Dict) -> List[EVRPSolution]:
+        """稳态模式：拒绝与种群中个体或同批子代相同的子代（不评估）"""
+        accepted = []
+        seen = set()
+        for child in children:
+            key = child.canonical_key()
+            self.clone_counts['offspring'] += 1
+            if key in population_keys or key in seen:
+                self.clone_counts['duplicates'] += 1
+                self.clone_counts['known'] += 1
+                continue
+            seen.add(key)
+            accepted.append(child)
+        return accepted
+        
+    def update_population_keys(self, population_keys: Dict, added: EVRPSolution, removed: EVRPSolution):
+        """替换个体后更新种群规范表示的计数"""
+        key = removed.canonical_key()
+        population_keys[key] -= 1
+        if population_keys[key] == 0:
+            del population_keys[key]
+        key = added.canonical_key()
+        population_keys[key] = population_keys.get(key, 0) + 1
+        
+    def population_index(self, solution: EVRPSolution) -> int:
+        """在按成本排序的种群中查找个体的位置，不在种群中返回-1"""
+        i = bisect.bisect_left(self.population, solution.total_cost, key=lambda x: x.total_cost)
+        while i < len(self.population) and self.population[i].total_cost == solution.total_cost:
+            if self.population[i] is solution:
+                return i
+            i += 1
+        return -1
+        
+    def replace_individual(self, child: EVRPSolution, parents: Tuple = ()) -> EVRPSolution:
+        """子代优于被替换个体时替换之，返回被替换的个体，未替换时返回None
+        
+        被替换个体为最差个体；替换策略为similar时为与子代共享弧最多且仍在种群中的亲本。
+        """
+        target = len(self.population) - 1
+        if self.replacement == 'similar' and parents:
+            arcs = child.arcs()
+            for parent in sorted(parents, key=lambda p: len(arcs & p.arcs()), reverse=True):
+                index = self.population_index(parent)
+                if index >= 0:
+                    target = index
+                    break
+                    
+        if child.total_cost >= self.population[target].total_cost:
+            return None
+            
+        removed = self.population.pop(target)
+        bisect.insort(self.population, child, key=lambda x: x.total_cost)
+        if child.total_cost < self.best_solution.total_cost:
+            self.best_solution = child.copy()
+        return removed
+        
+    def record_generation(self, cache_before: Dict[str, int]):
+        """记录本代的收敛历史和路径缓存统计"""
         self.generation_history.append({
             'generation': len(self.generation_history),
             'best_cost': self.best_solution.total_cost,
@@ -470,21 +1708,132 @@ class EVRPGeneticAlgorithm:
             'worst_cost': self.population[-1].total_cost
         })
         
-    def solve(self) -> EVRPSolution:
-        """求解EVRP问题"""
-        print("开始创建初始种群...")
-        self.create_initial_population()
+        # 本代路径缓存的命中/未命中/淘汰次数
+        cache_after = self.evaluator.cache.stats()
+        for name, count in cache_after.items():
+            self.generation_history[-1][f'cache_{name}'] = count - cache_before[name]
+            
+        # 本代局部搜索接受的各类动作数
+        if self.local_search is not None:
+            for name, count in self.local_search.move_counts.items():
+                self.generation_history[-1][f'ls_{name}'] = count
+            self.local_search.reset_counts()
+            
+        # 本代重复子代的比例与沿用评估结果的个体数
+        if self.reject_clones:
+            counts = self.clone_counts
+            self.generation_history[-1]['duplicate_rate'] = counts['duplicates'] / max(counts['offspring'], 1)
+            self.generation_history[-1]['known_skipped'] = counts['known']
+            self.clone_counts = {'offspring': 0, 'duplicates': 0, 'known': 0}
+            
+        # 本代各算子的调用次数、改进率、平均成本变化、CPU时间和选择概率
+        for name, stats in self.operator_selector.end_generation().items():
+            for stat, value in stats.items():
+                self.generation_history[-1][f'op_{name}_{stat}'] = value
         
-        print(f"初始最优成本: {self.best_solution.total_cost:.2f}")
+    def solve(self, initial_solutions: List = None, time_limit: float = None,
+              max_no_improvement: int = None, target_cost: float = None,
+              resume_from: str = None) -> EVRPSolution:
+        """求解EVRP问题
         
-        for generation in range(self.max_generations):
-            self.evolve()
+        Args:
+            initial_solutions: 热启动解
+            time_limit: 运行时间上限（秒）
+            max_no_improvement: 最优解连续多少代未改进即停止
+            target_cost: 最优成本不高于该值即停止
+            resume_from: 检查点文件，给定时从检查点继续运行
+        """
+        for _ in self.solve_iter(initial_solutions, time_limit, max_no_improvement, target_cost,
+                                 resume_from):
+            pass
             
-            if generation % 50 == 0:
-                print(f"第{generation}代: 最优成本 = {self.best_solution.total_cost:.2f}")
-                
         print(f"最终最优成本: {self.best_solution.total_cost:.2f}")
         return self.best_solution
+        
+    def solve_iter(self, initial_solutions: List = None, time_limit: float = None,
+                   max_no_improvement: int = None, target_cost: float = None,
+                   resume_from: str = None):
+        """逐步求解，每当最优解改进时产生一个ImprovementEvent
+        
+        调用方可随时停止迭代；终止条件与solve()相同，终止原因记录在stop_reason。
+        """
+        start_time = time.time()
+        last_checkpoint = start_time
+        self.stop_reason = 'interrupted'
+        
+        def event(generation: int) -> ImprovementEvent:
+            now = time.time()
+            return ImprovementEvent(self.best_solution, self.best_solution.total_cost,
+                                    generation, now, now - start_time, self.evaluations)
+            
+        try:
+            if resume_from is not None:
+                # 从检查点恢复，已用时间计入时间上限
+                meta = self.load_checkpoint(resume_from)
+                start_time -= meta['elapsed']
+                last_improvement = meta['last_improvement']
+                start_generation = len(self.generation_history)
+                print(f"从检查点恢复: 第{start_generation}代, 最优成本 = {self.best_solution.total_cost:.2f}")
+            else:
+                print("开始创建初始种群...")
+                self.create_initial_population(initial_solutions)
+                last_improvement = -1
+                start_generation = 0
+                print(f"初始最优成本: {self.best_solution.total_cost:.2f}")
+            yield event(start_generation - 1)
+            
+            self.stop_reason = 'max_generations'
+            for generation in range(start_generation, self.max_generations):
+                if target_cost is not None and self.best_solution.total_cost <= target_cost:
+                    self.stop_reason = 'target_cost'
+                    break
+                if time_limit is not None and time.time() - start_time >= time_limit:
+                    self.stop_reason = 'time_limit'
+                    break
+                if max_no_improvement is not None and generation - 1 - last_improvement >= max_no_improvement:
+                    self.stop_reason = 'no_improvement'
+                    break
+                    
+                best_cost = self.best_solution.total_cost
+                self.evolve()
+                
+                if generation % 50 == 0:
+                    print(f"第{generation}代: 最优成本 = {self.best_solution.total_cost:.2f}")
+                    
+                improved = self.best_solution.total_cost < best_cost
+                if improved:
+                    last_improvement = generation
+                    
+                # 定期保存检查点
+                now = time.time()
+                if self.checkpoint_path and (
+                        (self.checkpoint_interval and (generation + 1) % self.checkpoint_interval == 0) or
+                        (self.checkpoint_seconds and now - last_checkpoint >= self.checkpoint_seconds)):
+                    self.save_checkpoint(self.checkpoint_path, now - start_time, last_improvement)
+                    last_checkpoint = now
+                    
+                if improved:
+                    yield event(generation)
+        except GeneratorExit:
+            self.stop_reason = 'interrupted'
+            raise
+        finally:
+            self.close()
+        
+    def save_checkpoint(self, path: str, elapsed: float = 0.0, last_improvement: int = -1):
+        """保存种群、最优解、随机数状态和收敛历史到二进制检查点"""
+        from evrp_checkpoint import save_checkpoint
+        save_checkpoint(self, path, elapsed, last_improvement)
+        
+    def load_checkpoint(self, path: str) -> dict:
+        """从检查点恢复状态，返回检查点元数据"""
+        from evrp_checkpoint import load_checkpoint
+        return load_checkpoint(self, path)
+        
+    def close(self):
+        """释放并行评估占用的进程池和共享内存"""
+        if hasattr(self.batch_evaluator, 'close'):
+            self.batch_evaluator.close()
 
 
 class EVRPVisualizer:
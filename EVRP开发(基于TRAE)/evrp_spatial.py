@@ -0,0 +1,62 @@
+"""
+EVRP空间索引
+Sorted-neighbor spatial index for station / neighbor queries
+
+问题编译后已有稠密距离矩阵，因此对每个节点一次性按距离对充电站排序
+（距离相同时索引小者优先），并保留每个节点最近的若干客户。
+最近充电站为O(1)查表，电量半径内的充电站为一次二分查找，
+k近邻客户为切片；结果与线性扫描完全一致。
+排序表占用N×M个索引和距离，与已有的距离矩阵同阶。
+"""
+
+import numpy as np
+
+from evrp_solver import EVRPProblem
+
+
+class SpatialIndex:
+    """问题实例的空间索引：最近充电站、k近邻客户、电量半径内的充电站"""
+    
+    def __init__(self, problem: EVRPProblem, max_neighbors: int = 64):
+        problem = problem.compile()
+        self.problem = problem
+        distances = problem.distance_matrix
+        
+        # 每个节点到各充电站按距离排序
+        stations = problem.station_indices
+        order = np.argsort(distances[:, stations], axis=1, kind='stable')
+        self.station_order = stations[order].astype(np.int32)
+        self.station_distances = np.take_along_axis(distances[:, stations], order, axis=1)
+        
+        # 每个节点最近的max_neighbors + 1个客户（含自身，查询时去掉）
+        customers = problem.customer_indices
+        self.max_neighbors = min(max_neighbors, len(customers))
+        order = np.argsort(distances[:, customers], axis=1, kind='stable')
+        self.customer_order = customers[order[:, :self.max_neighbors + 1]].astype(np.int32)
+    
+    def nearest_station(self, i: int) -> int:
+        """距离节点i最近的充电站索引；没有充电站时返回-1"""
+        row = self.station_order[i]
+        return int(row[0]) if len(row) else -1
+    
+    def nearest_customers(self, i: int, k: int) -> np.ndarray:
+        """距离节点i最近的k个客户索引（不含i），按距离升序"""
+        if k > self.max_neighbors:
+            customers = self.problem.customer_indices
+            row = self.problem.distance_matrix[i, customers]
+            order = customers[np.argsort(row, kind='stable')]
+        else:
+            order = self.customer_order[i]
+        return order[order != i][:k]
+    
+    def stations_within(self, i: int, radius: float) -> np.ndarray:
+        """与节点i距离不超过radius的充电站索引（按索引升序）"""
+        end = np.searchsorted(self.station_distances[i], radius, side='right')
+        return np.sort(self.station_order[i][:end])
+    
+    def reachable_stations(self, i: int, battery: float) -> np.ndarray:
+        """从节点i以剩余电量battery可能到达的充电站（电量半径的超集，调用方再按能耗精确筛选）"""
+        rate = self.problem.consumption_rate
+        if rate <= 0:
+            return self.problem.station_indices
+        return self.stations_within(i, battery / rate * (1 + 1e-9))
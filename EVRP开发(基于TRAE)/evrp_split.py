@@ -0,0 +1,158 @@
+"""
+EVRP最优分割解码器
+Split decoder: giant tour -> routes (Bellman DP)
+
+将客户排列（巨型路径）按顺序切分为若干条路径，使总成本最小。
+路径成本与EVRPEvaluator一致：行驶距离 + 违反约束次数 × VIOLATION_PENALTY，
+电量不足时在弧上插入绕行代价最小的可达充电站。
+"""
+
+import numpy as np
+from typing import List, Tuple, NamedTuple
+
+from evrp_solver import (EVRPProblem, EVRPSolution, Route, NODE_CUSTOMER,
+                         VIOLATION_PENALTY)
+
+
+class SplitState(NamedTuple):
+    """路径延伸过程中的状态"""
+    prev: int          # 上一个节点的稠密索引
+    time: float        # 离开上一个节点的时间
+    battery: float     # 离开上一个节点时的电量
+    load: float        # 累计载重
+    distance: float    # 累计行驶距离（不含返回配送中心）
+    violations: int    # 违反约束次数
+    station: int       # 本次延伸插入的充电站索引，-1表示未充电
+
+
+class SplitDecoder:
+    """最优分割解码器
+    
+    对起点j向后逐个延伸路径，状态增量更新，每个前驱只扫描到载重超限为止，
+    复杂度为O(n·L)，L为单条路径可容纳的客户数。
+    """
+    
+    def __init__(self, problem: EVRPProblem, max_route_length: int = 0):
+        self.problem = problem.compile()
+        self.max_route_length = max_route_length  # 单条路径最多客户数，0表示不限制
+        # 逐点访问用列表，比逐个索引ndarray快
+        self.demands = self.problem.demands.tolist()
+        self.service_times = self.problem.service_times.tolist()
+        self.tw_early = self.problem.tw_early.tolist()
+        self.tw_late = self.problem.tw_late.tolist()
+        self.charging_rates = self.problem.charging_rates.tolist()
+        self.detour_table = self.problem.detour_table()  # 充电绕行查表
+    
+    def start_state(self) -> SplitState:
+        """从配送中心出发的初始状态"""
+        problem = self.problem
+        return SplitState(problem.depot.index, 0.0, problem.vehicle_battery, 0.0, 0.0, 0, -1)
+    
+    def extend(self, state: SplitState, j: int) -> SplitState:
+        """在路径末尾追加客户j，必要时先绕行充电站"""
+        problem = self.problem
+        prev, time, battery, load, distance, violations, _ = state
+        station = -1
+        
+        if battery < problem.distance_rows[prev][j] * problem.consumption_rate:
+            station = self.best_detour(prev, j, battery)
+            if station >= 0:
+                # 按评估器的顺序更新：行驶、到站充满电
+                leg = problem.distance_rows[prev][station]
+                distance += leg
+                time += leg / problem.speed
+                battery -= leg * problem.consumption_rate
+                time += (problem.vehicle_battery - battery) / self.charging_rates[station]
+                battery = problem.vehicle_battery
+                prev = station
+            
+        leg = problem.distance_rows[prev][j]
+        energy_needed = leg * problem.consumption_rate
+        if battery < energy_needed:
+            violations += 1
+        if load + self.demands[j] > problem.vehicle_capacity:
+            violations += 1
+        load += self.demands[j]
+        
+        time += leg / problem.speed
+        battery -= energy_needed
+        if not (self.tw_early[j] <= time <= self.tw_late[j]):
+            violations += 1
+        time += self.service_times[j]
+        distance += leg
+        return SplitState(j, time, battery, load, distance, violations, station)
+    
+    def best_detour(self, i: int, j: int, battery: float) -> int:
+        """当前电量可达、且充满后能到达j的绕行距离最短的充电站；没有则返回-1"""
+        return self.detour_table.best_reachable(i, j, battery)
+    
+    def route_cost(self, state: SplitState) -> float:
+        """路径返回配送中心后的成本"""
+        cost = state.distance + self.problem.distance_rows[state.prev][self.problem.depot.index]
+        if state.violations > 0:
+            cost += VIOLATION_PENALTY * state.violations
+        return cost
+    
+    def split(self, order: List[int]) -> Tuple[float, List[int]]:
+        """求最优切分
+        
+        Args:
+            order: 客户稠密索引的排列
+            
+        Returns:
+            (最小总成本, 切分点列表)，第r条路径为order[breaks[r]:breaks[r+1]]
+        """
+        n = len(order)
+        capacity = self.problem.vehicle_capacity
+        max_length = self.max_route_length or n
+        best = [0.0] + [float('inf')] * n
+        pred = [0] * (n + 1)
+        
+        for start in range(n):
+            base = best[start]
+            state = self.start_state()
+            for end in range(start, min(n, start + max_length)):
+                state = self.extend(state, order[end])
+                # 单个客户的路径总是允许，保证总有可行的切分
+                if end > start and state.load > capacity:
+                    break
+                cost = base + self.route_cost(state)
+                if cost < best[end + 1]:
+                    best[end + 1] = cost
+                    pred[end + 1] = start
+            
+        breaks = [n]
+        while breaks[-1] > 0:
+            breaks.append(pred[breaks[-1]])
+        breaks.reverse()
+        return best[n], breaks
+    
+    def build_route(self, segment: List[int]) -> Route:
+        """按与split相同的规则重建路径（含充电绕行）"""
+        nodes = self.problem.nodes
+        route = Route(self.problem)
+        state = self.start_state()
+        for j in segment:
+            state = self.extend(state, j)
+            if state.station >= 0:
+                route.sequence.append(nodes[state.station])
+            route.sequence.append(nodes[j])
+        return route
+    
+    def decode(self, order: List) -> EVRPSolution:
+        """将客户排列解码为解决方案（未评估）
+        
+        order可以是客户对象或稠密索引的序列。
+        """
+        order = [c if isinstance(c, (int, np.integer)) else c.index for c in order]
+        _, breaks = self.split(order)
+        solution = EVRPSolution(self.problem)
+        for start, end in zip(breaks[:-1], breaks[1:]):
+            solution.routes.append(self.build_route(order[start:end]))
+        return solution
+    
+    @staticmethod
+    def giant_tour(solution: EVRPSolution) -> List[int]:
+        """按路径顺序拼接客户，得到巨型路径（去掉充电站）"""
+        return [node.index for route in solution.routes for node in route.sequence
+                if node.node_type == NODE_CUSTOMER]
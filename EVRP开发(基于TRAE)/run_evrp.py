@@ -11,6 +11,8 @@ import json
 from datetime import datetime
 
 from evrp_solver import EVRPProblem, EVRPGeneticAlgorithm, EVRPVisualizer
+from evrp_island import EVRPIslandModel
+from evrp_lns import EVRPLargeNeighborhoodSearch
 from data_generator import EVRPDataGenerator
 from config import ConfigManager
 
@@ -70,8 +72,9 @@ def save_results(solution, ga, output_dir: str, problem_name: str):
 
 
 def run_single_instance(problem: EVRPProblem, config: ConfigManager, 
-                       output_dir: str, problem_name: str) -> dict:
-    """运行单个实例"""
+                       output_dir: str, problem_name: str, resume: bool = False,
+                       algorithm: str = 'ga') -> dict:
+    """运行单个实例；resume为True时从输出目录中的检查点继续，algorithm为ga或lns"""
     print(f"\n{'='*60}")
     print(f"求解问题: {problem_name}")
     print(f"客户数量: {len(problem.customers)}")
@@ -80,18 +83,89 @@ def run_single_instance(problem: EVRPProblem, config: ConfigManager,
     print(f"电池容量: {problem.vehicle_battery}")
     
     # 创建遗传算法
-    ga = EVRPGeneticAlgorithm(
-        problem=problem,
+    checkpoint_path = f"{output_dir}/checkpoint.npz"
+    ga_params = dict(
         population_size=config.ga.population_size,
         max_generations=config.ga.max_generations,
         crossover_rate=config.ga.crossover_rate,
         mutation_rate=config.ga.mutation_rate,
-        elite_size=config.ga.elite_size
+        elite_size=config.ga.elite_size,
+        batch_evaluation=config.ga.batch_evaluation,
+        route_cache_size=config.ga.route_cache_size,
+        split_decoder=config.ga.split_decoder,
+        num_workers=config.ga.num_workers,
+        ga_mode=config.ga.ga_mode,
+        steady_state_offspring=config.ga.steady_state_offspring,
+        replacement=config.ga.replacement,
+        local_search_rate=config.ga.local_search_rate,
+        local_search_neighbors=config.ga.local_search_neighbors,
+        charging_placement=config.ga.charging_placement,
+        reject_clones=config.ga.reject_clones,
+        construction_share=config.ga.construction_share,
+        crossover_operator=config.ga.crossover_operator,
+        repair_method=config.ga.repair_method,
+        regret_k=config.ga.regret_k,
+        operator_selection=config.ga.operator_selection
+    )
+    
+    if algorithm == 'lns':
+        # 破坏-重建大邻域搜索，与遗传算法共用终止条件
+        ga = EVRPLargeNeighborhoodSearch(
+            problem=problem,
+            max_iterations=config.lns.max_iterations,
+            segment_length=config.lns.segment_length,
+            removal_operators=config.lns.removal_operators,
+            min_removal=config.lns.min_removal,
+            max_removal=config.lns.max_removal,
+            removal_fraction=config.lns.removal_fraction,
+            max_string_length=config.lns.max_string_length,
+            regret_k=config.lns.regret_k,
+            start_temperature=config.lns.start_temperature,
+            end_temperature=config.lns.end_temperature,
+            operator_selection=config.lns.operator_selection,
+            route_cache_size=config.ga.route_cache_size
+        )
+    elif config.island.num_islands > 1:
+        # 岛屿模型：多个进程各自进化，定期迁移
+        ga = EVRPIslandModel(
+            problem=problem,
+            ga_params=ga_params,
+            num_islands=config.island.num_islands,
+            migration_interval=config.island.migration_interval,
+            migration_size=config.island.migration_size,
+            topology=config.island.topology,
+            seed=config.island.seed
+        )
+    else:
+        ga = EVRPGeneticAlgorithm(
+            problem=problem,
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval=config.ga.checkpoint_interval,
+            checkpoint_seconds=config.ga.checkpoint_seconds,
+            **ga_params
+        )
+    
+    stop_params = dict(
+        time_limit=config.ga.time_limit or None,
+        max_no_improvement=config.ga.max_no_improvement or None,
+        target_cost=config.ga.target_cost
     )
     
     # 求解
     start_time = time.time()
-    solution = ga.solve()
+    if isinstance(ga, EVRPLargeNeighborhoodSearch):
+        if resume:
+            print("大邻域搜索不支持检查点，重新开始求解")
+        solution = ga.solve(**stop_params)
+    elif isinstance(ga, EVRPIslandModel):
+        if resume:
+            print("岛屿模型不支持检查点，重新开始求解")
+        solution = ga.solve(**stop_params)
+    elif resume and os.path.exists(checkpoint_path):
+        print(f"从检查点继续: {checkpoint_path}")
+        solution = ga.solve(resume_from=checkpoint_path, **stop_params)
+    else:
+        solution = ga.solve(**stop_params)
     end_time = time.time()
     
     # 可视化
@@ -116,8 +190,9 @@ def run_single_instance(problem: EVRPProblem, config: ConfigManager,
     }
 
 
-def run_benchmark(config: ConfigManager, test_dir: str = "test_instances"):
-    """运行基准测试"""
+def run_benchmark(config: ConfigManager, test_dir: str = "test_instances", resume_dir: str = None,
+                  algorithm: str = 'ga'):
+    """运行基准测试；给定resume_dir时跳过已完成的实例，未完成的从检查点继续"""
     print("运行基准测试...")
     
     # 确保测试实例存在
@@ -127,7 +202,7 @@ def run_benchmark(config: ConfigManager, test_dir: str = "test_instances"):
         generator.generate_test_suite(test_dir)
     
     # 创建输出目录
-    output_dir = create_output_directory("benchmark_results")
+    output_dir = resume_dir or create_output_directory("benchmark_results")
     
     results = []
     test_files = [f for f in os.listdir(test_dir) if f.endswith('.json')]
@@ -144,8 +219,24 @@ def run_benchmark(config: ConfigManager, test_dir: str = "test_instances"):
         instance_dir = f"{output_dir}/{problem_name}"
         os.makedirs(instance_dir, exist_ok=True)
         
+        # 已完成的实例直接读取摘要
+        summary_file = f"{instance_dir}/summary.json"
+        if resume_dir and os.path.exists(summary_file):
+            with open(summary_file, 'r') as f:
+                summary = json.load(f)
+            results.append({
+                'problem': problem_name,
+                'total_cost': summary['total_cost'],
+                'num_vehicles': summary['num_vehicles'],
+                'feasible': summary['feasible'],
+                'computation_time': summary['computation_time']
+            })
+            print(f"跳过已完成: {problem_name}")
+            continue
+        
         # 运行
-        result = run_single_instance(problem, config, instance_dir, problem_name)
+        result = run_single_instance(problem, config, instance_dir, problem_name,
+                                     resume=resume_dir is not None, algorithm=algorithm)
         results.append(result)
         
         print(f"完成: {problem_name}, 成本: {result['total_cost']:.2f}, "
@@ -193,6 +284,10 @@ def main():
                        help='充电站数量（用于生成新实例）')
     parser.add_argument('--distribution', choices=['uniform', 'clustered'],
                        default='uniform', help='客户分布类型')
+    parser.add_argument('--resume', type=str,
+                       help='从指定输出目录中的检查点继续运行（基准测试时为benchmark_results下的目录）')
+    parser.add_argument('--algorithm', choices=['ga', 'lns'], default='ga',
+                       help='求解算法：ga遗传算法，lns破坏-重建大邻域搜索')
     
     args = parser.parse_args()
     
@@ -226,7 +321,7 @@ def main():
         
     elif args.benchmark:
         # 运行基准测试
-        results = run_benchmark(config)
+        results = run_benchmark(config, resume_dir=args.resume, algorithm=args.algorithm)
         
     elif args.problem:
         # 运行单个问题实例
@@ -238,8 +333,9 @@ def main():
         problem = generator.load_problem_instance(args.problem)
         problem_name = os.path.basename(args.problem).replace('.json', '')
         
-        output_dir = create_output_directory(args.output)
-        run_single_instance(problem, config, output_dir, problem_name)
+        output_dir = args.resume or create_output_directory(args.output)
+        run_single_instance(problem, config, output_dir, problem_name, resume=args.resume is not None,
+                            algorithm=args.algorithm)
         
     else:
         # 运行默认示例
@@ -247,8 +343,9 @@ def main():
         from evrp_solver import create_sample_problem
         
         problem = create_sample_problem()
-        output_dir = create_output_directory(args.output)
-        run_single_instance(problem, config, output_dir, "default_example")
+        output_dir = args.resume or create_output_directory(args.output)
+        run_single_instance(problem, config, output_dir, "default_example", resume=args.resume is not None,
+                            algorithm=args.algorithm)
     
     print("\n运行完成!")
 